@@ -0,0 +1,266 @@
+"""Kayıtlı oyunlar üzerinde akış tabanlı istatistikler.
+
+Olay günlükleri (``replay_log``) üreteç zinciriyle okunur: olaylar oyunlara
+gruplanır, her oyun bitince (renk sayısı, uzunluk, mod) anahtarlı toplamlara
+eklenir ve bellekten atılır. Bellekte yalnızca o an açık olan oyunlar ve
+yapılandırma başına birkaç sayaç tutulur.
+
+Kullanım::
+
+    python analytics.py game_events*.log --processes 4 --compare-solver
+"""
+from __future__ import annotations
+
+import argparse
+import multiprocessing
+import random
+from dataclasses import dataclass, field, fields
+from functools import lru_cache
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from game import Solver, derive_seed, feedback
+from replay_log import GameEvent, read_events
+from web_game import MODE_LABELS, HistoryEntry, OfflinePlayerVsAIGame
+
+ConfigKey = Tuple[int, int, str]
+
+# Bu kadar süre olay gelmeyen açık oyunlar (çöken sunucu vb.) bırakılır.
+STALE_AFTER = 24 * 60 * 60
+SOLVER_GUESS_LIMIT = 64
+# Bu modlarda tahminler oyun sonunda topluca kaydedilir; hamle süresi ölçülemez.
+UNTIMED_MODES = frozenset({OfflinePlayerVsAIGame.mode_key})
+
+
+@dataclass
+class GameRecord:
+    game_id: str
+    mode: str
+    palette: str
+    length: int
+    max_attempts: int
+    started_at: float
+    history: List[HistoryEntry] = field(default_factory=list)
+    move_times: List[float] = field(default_factory=list)
+    status: str = "ongoing"
+    winner: Optional[str] = None
+    secret: Tuple[str, ...] = ()
+
+    @property
+    def key(self) -> ConfigKey:
+        return (len(self.palette), self.length, self.mode)
+
+    def winner_guesses(self) -> int:
+        """Kazananın kendi tahmin sayısı (sıralı PvP'de rakibin tahminleri sayılmaz)."""
+        return sum(1 for entry in self.history if entry.player == self.winner)
+
+
+@dataclass
+class ConfigStats:
+    games: int = 0
+    finished: int = 0
+    wins: int = 0
+    abandoned: int = 0
+    rejected: int = 0
+    guesses_to_win: int = 0
+    moves_timed: int = 0
+    move_time_total: float = 0.0
+    solver_games: int = 0
+    solver_guesses: int = 0
+    human_guesses: int = 0
+    solver_better: int = 0
+
+    def add(self, game: GameRecord, compare_solver: bool = False) -> None:
+        self.games += 1
+        self.moves_timed += len(game.move_times)
+        self.move_time_total += sum(game.move_times)
+        if game.status == "abandoned":
+            self.abandoned += 1
+            return
+        if game.status == "rejected":
+            # Geri bildirimleri tutmayan çevrimdışı oyunlar sonuçlara katılmaz.
+            self.rejected += 1
+            return
+        self.finished += 1
+        if game.status == "won":
+            self.wins += 1
+            self.guesses_to_win += game.winner_guesses()
+        if compare_solver and game.secret:
+            solved_in = solver_guess_count(game.palette, game.length, game.secret)
+            # Kaybedilen oyunlarda oyuncu en iyi ihtimalle bir sonraki denemede çözerdi;
+            # max_attempts her modda oyuncu başınadır.
+            human = game.winner_guesses() if game.status == "won" else game.max_attempts + 1
+            self.solver_games += 1
+            self.solver_guesses += solved_in
+            self.human_guesses += human
+            if solved_in < human:
+                self.solver_better += 1
+
+    def merge(self, other: "ConfigStats") -> None:
+        for f in fields(self):
+            setattr(self, f.name, getattr(self, f.name) + getattr(other, f.name))
+
+    def summary(self) -> Dict[str, Optional[float]]:
+        def ratio(num: float, den: int) -> Optional[float]:
+            return num / den if den else None
+
+        return {
+            "games": self.games,
+            "win_rate": ratio(self.wins, self.finished),
+            "avg_guesses_to_win": ratio(self.guesses_to_win, self.wins),
+            "avg_move_seconds": ratio(self.move_time_total, self.moves_timed),
+            "abandoned": self.abandoned,
+            "rejected": self.rejected,
+            "solver_avg_guesses": ratio(self.solver_guesses, self.solver_games),
+            "human_avg_guesses": ratio(self.human_guesses, self.solver_games),
+            "solver_better_rate": ratio(self.solver_better, self.solver_games),
+        }
+
+
+@lru_cache(maxsize=65536)
+def solver_guess_count(palette: str, length: int, secret: Tuple[str, ...]) -> int:
+    """``Solver``ın aynı gizli kodu kaç tahminde bulduğunu döndürür."""
+    # Sonuç önbelleğe alındığı için Solver'ın akışı gizli koddan türetilir.
+    rng = random.Random(derive_seed(0, palette, "".join(secret)))
+    solver = Solver(length, list(palette), rng)
+    for attempt in range(1, SOLVER_GUESS_LIMIT + 1):
+        guess = solver.next_guess()
+        ex, co = feedback(secret, guess)
+        if ex == length:
+            return attempt
+        solver.apply_feedback(guess, (ex, co))
+    return SOLVER_GUESS_LIMIT
+
+
+# -----------------------
+# Üreteç zinciri
+# -----------------------
+def iter_games(events: Iterable[GameEvent], stale_after: float = STALE_AFTER) -> Iterator[GameRecord]:
+    """Olay akışını biten oyunlara dönüştürür."""
+    open_games: Dict[str, GameRecord] = {}
+    last_seen: Dict[str, float] = {}
+    pending_guess: Dict[str, Tuple[str, Tuple[str, ...]]] = {}
+    next_sweep = 0.0
+
+    for event in events:
+        gid = event.game_id
+        data = event.data
+        if event.kind == "start":
+            open_games[gid] = GameRecord(
+                game_id=gid,
+                mode=str(data["mode"]),
+                palette=str(data["palette"]),
+                length=int(data["length"]),  # type: ignore[arg-type]
+                max_attempts=int(data["max_attempts"]),  # type: ignore[arg-type]
+                started_at=event.timestamp,
+            )
+            last_seen[gid] = event.timestamp
+        elif gid not in open_games:
+            continue
+        elif event.kind == "guess":
+            game = open_games[gid]
+            if game.mode not in UNTIMED_MODES:
+                game.move_times.append(event.timestamp - last_seen[gid])
+            last_seen[gid] = event.timestamp
+            pending_guess[gid] = (str(data["player"]), tuple(data["guess"]))  # type: ignore[arg-type]
+        elif event.kind == "feedback":
+            player, guess = pending_guess.pop(gid, ("", ()))
+            open_games[gid].history.append(
+                HistoryEntry(player, guess, int(data["exact"]), int(data["color_only"]))  # type: ignore[arg-type]
+            )
+        elif event.kind == "end":
+            game = open_games.pop(gid)
+            last_seen.pop(gid, None)
+            pending_guess.pop(gid, None)
+            game.status = str(data["status"])
+            game.winner = data["winner"]  # type: ignore[assignment]
+            game.secret = tuple(data["secret"])  # type: ignore[arg-type]
+            yield game
+
+        if event.timestamp >= next_sweep:
+            cutoff = event.timestamp - stale_after
+            for stale in [g for g, ts in last_seen.items() if ts < cutoff]:
+                open_games.pop(stale, None)
+                last_seen.pop(stale, None)
+                pending_guess.pop(stale, None)
+            next_sweep = event.timestamp + stale_after / 24
+
+
+def aggregate(games: Iterable[GameRecord], compare_solver: bool = False) -> Dict[ConfigKey, ConfigStats]:
+    totals: Dict[ConfigKey, ConfigStats] = {}
+    for game in games:
+        stats = totals.get(game.key)
+        if stats is None:
+            stats = totals[game.key] = ConfigStats()
+        stats.add(game, compare_solver)
+    return totals
+
+
+def aggregate_file(path: str, compare_solver: bool = False) -> Dict[ConfigKey, ConfigStats]:
+    return aggregate(iter_games(read_events(path)), compare_solver)
+
+
+def _aggregate_job(args: Tuple[str, bool]) -> Dict[ConfigKey, ConfigStats]:
+    return aggregate_file(*args)
+
+
+def merge_totals(parts: Iterable[Dict[ConfigKey, ConfigStats]]) -> Dict[ConfigKey, ConfigStats]:
+    merged: Dict[ConfigKey, ConfigStats] = {}
+    for part in parts:
+        for key, stats in part.items():
+            if key in merged:
+                merged[key].merge(stats)
+            else:
+                merged[key] = stats
+    return merged
+
+
+def aggregate_files(
+    paths: Sequence[str],
+    processes: int = 1,
+    compare_solver: bool = False,
+) -> Dict[ConfigKey, ConfigStats]:
+    """Her dosyayı ayrı bir süreçte işleyip sonuçları birleştirir.
+
+    Bir oyunun olayları tek bir dosyada olmalıdır; dosyalar arasında bölünen
+    oyunlar eksik sayılır.
+    """
+    jobs = [(path, compare_solver) for path in paths]
+    if processes <= 1 or len(jobs) <= 1:
+        return merge_totals(_aggregate_job(job) for job in jobs)
+    with multiprocessing.Pool(processes) as pool:
+        return merge_totals(pool.imap_unordered(_aggregate_job, jobs))
+
+
+def _fmt(value: Optional[float], digits: int = 2) -> str:
+    return "-" if value is None else f"{value:.{digits}f}"
+
+
+def print_report(totals: Dict[ConfigKey, ConfigStats]) -> None:
+    print("Renk | Uzunluk | Mod                               | Oyun    | Kazanma | Ort. tahmin | Ort. süre (sn) | Solver ort.")
+    print("---- | ------- | --------------------------------- | ------- | ------- | ----------- | -------------- | -----------")
+    for (colors, length, mode), stats in sorted(totals.items()):
+        s = stats.summary()
+        label = MODE_LABELS.get(mode, mode)
+        print(
+            f"{colors:>4} | {length:>7} | {label:<33} | {stats.games:>7} | "
+            f"{_fmt(s['win_rate']):>7} | {_fmt(s['avg_guesses_to_win']):>11} | "
+            f"{_fmt(s['avg_move_seconds']):>14} | {_fmt(s['solver_avg_guesses']):>11}"
+        )
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Kayıtlı oyunlardan istatistik üretir.")
+    parser.add_argument("paths", nargs="+", help="Olay günlüğü dosyaları")
+    parser.add_argument("--processes", type=int, default=1, help="Paralel süreç sayısı")
+    parser.add_argument(
+        "--compare-solver",
+        action="store_true",
+        help="Aynı gizli kodları Solver ile de çöz ve karşılaştır",
+    )
+    args = parser.parse_args(argv)
+    totals = aggregate_files(args.paths, args.processes, args.compare_solver)
+    print_report(totals)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,18 +1,46 @@
 from __future__ import annotations
 
+import atexit
+import os
 import uuid
 from typing import Dict, Optional
 
 from flask import Flask, jsonify, render_template, request, session
 
 from game import COLOR_NAMES, PALETTES
-from web_game import BaseGame, GameError, available_palettes, create_game
+from rate_limit import DEFAULT_RULES, MemoryBackend, RateLimiter, SQLiteBackend
+from replay_log import EventLogWriter
+from strategy import load_table, recommended_attempts
+from web_game import (
+    BaseGame,
+    GameError,
+    OfflinePlayerVsAIGame,
+    available_palettes,
+    create_game,
+)
 
 app = Flask(__name__)
 app.secret_key = "mastermind-secret-key"
 
 _games: Dict[str, BaseGame] = {}
 
+# strategy.py ile üretilen tablo; yoksa deneme hakkı önerisi yapılmaz.
+_strategy_table = load_table()
+
+# MASTERMIND_EVENT_LOG tanımlıysa oyun olayları bu dosyaya kaydedilir.
+_event_log: Optional[EventLogWriter] = None
+_event_log_path = os.environ.get("MASTERMIND_EVENT_LOG")
+if _event_log_path:
+    _event_log = EventLogWriter(_event_log_path)
+    atexit.register(_event_log.close)
+
+# MASTERMIND_RATE_LIMIT_DB tanımlıysa sınırlar süreçler arasında SQLite ile paylaşılır.
+_rate_limit_db = os.environ.get("MASTERMIND_RATE_LIMIT_DB")
+_limiter = RateLimiter(
+    DEFAULT_RULES,
+    SQLiteBackend(_rate_limit_db) if _rate_limit_db else MemoryBackend(),
+)
+
 
 def _ensure_game_id() -> str:
     gid = session.get("game_id")
@@ -37,7 +65,35 @@ def _set_game(game: BaseGame) -> None:
 def _clear_game() -> None:
     gid = session.pop("game_id", None)
     if gid and gid in _games:
-        _games.pop(gid, None)
+        _abandon(_games.pop(gid))
+
+
+def _abandon(game: Optional[BaseGame]) -> None:
+    if _event_log and game and game.status == "ongoing":
+        _event_log.log_end(game, status="abandoned")
+
+
+def _log_if_finished(game: BaseGame, was_ongoing: bool) -> None:
+    if _event_log and was_ongoing and game.status != "ongoing":
+        _event_log.log_end(game)
+
+
+@app.before_request
+def _enforce_rate_limit():
+    endpoint = request.endpoint or ""
+    if endpoint not in _limiter.rules:
+        return None
+    identities = [f"ip:{request.remote_addr or '-'}"]
+    gid = session.get("game_id")
+    if gid:
+        identities.append(f"sid:{gid}")
+    retry_after = _limiter.check(endpoint, identities)
+    if not retry_after:
+        return None
+    response = jsonify({"error": "Çok fazla istek gönderildi. Biraz bekleyip tekrar dene."})
+    response.status_code = 429
+    response.headers["Retry-After"] = str(max(1, int(retry_after + 0.999)))
+    return response
 
 
 @app.route("/")
@@ -46,6 +102,10 @@ def index():
         "index.html",
         color_names=COLOR_NAMES,
         palettes=available_palettes(),
+        recommended_attempts={
+            key: {"worst_case": entry["worst_case"], "exact": bool(entry.get("exact"))}
+            for key, entry in _strategy_table.items()
+        },
     )
 
 
@@ -54,6 +114,9 @@ def get_state():
     game = _get_game()
     if not game:
         return jsonify({"state": None})
+    was_ongoing = game.status == "ongoing"
+    game.tick()
+    _log_if_finished(game, was_ongoing)
     return jsonify({"state": game.to_dict()})
 
 
@@ -84,12 +147,21 @@ def start_game():
             symbols=symbols,
             max_attempts=max_attempts,
             players=players,
+            offline=bool(data.get("offline")),
         )
     except GameError as exc:
         return jsonify({"error": str(exc)}), 400
 
+    _abandon(_get_game())
     _set_game(game)
-    return jsonify({"state": game.to_dict()})
+    if _event_log:
+        _event_log.log_start(game)
+    return jsonify(
+        {
+            "state": game.to_dict(),
+            "recommended_attempts": recommended_attempts(_strategy_table, color_count, length),
+        }
+    )
 
 
 @app.post("/guess")
@@ -102,13 +174,55 @@ def submit_guess():
     if not isinstance(guess, list):
         return jsonify({"error": "Tahmin verisi gönderilmedi."}), 400
     player = data.get("player")
+    was_ongoing = game.status == "ongoing"
+    guesses_before = len(game.history)
     try:
         game.make_guess(guess, player=player)
     except GameError as exc:
+        _log_if_finished(game, was_ongoing)
         return jsonify({"error": str(exc), "state": game.to_dict()}), 400
+    # Yarış modunda yapay zekâ önce kazandıysa tahmin geçmişe eklenmez.
+    if _event_log and len(game.history) > guesses_before:
+        _event_log.log_guess(game, game.history[-1])
+    _log_if_finished(game, was_ongoing)
     return jsonify({"state": game.to_dict()})
 
 
+@app.post("/finish")
+def finish_offline_game():
+    game = _get_game()
+    if not isinstance(game, OfflinePlayerVsAIGame):
+        return jsonify({"error": "Çevrimdışı oyun bulunamadı."}), 400
+    data = request.get_json(silent=True) or {}
+    guesses = data.get("guesses")
+    claimed = data.get("feedback")
+    if not isinstance(guesses, list) or not isinstance(claimed, list):
+        return jsonify({"error": "Tahmin geçmişi gönderilmedi."}), 400
+    if not all(isinstance(item, list) for item in guesses + claimed):
+        return jsonify({"error": "Tahmin geçmişi eksik veya hatalı."}), 400
+    was_ongoing = game.status == "ongoing"
+    try:
+        verification = game.verify_history(guesses, claimed)
+    except GameError as exc:
+        return jsonify({"error": str(exc), "state": game.to_dict()}), 400
+    # Tahminler burada topluca kaydedilir; analytics bu mod için hamle süresi hesaplamaz.
+    if _event_log:
+        for entry in game.history:
+            _event_log.log_guess(game, entry)
+    _log_if_finished(game, was_ongoing)
+    return jsonify({"state": game.to_dict(), "verification": verification})
+
+
+@app.get("/metrics")
+def metrics():
+    return jsonify(
+        {
+            "rate_limit": _limiter.counters(),
+            "active_games": len(_games),
+        }
+    )
+
+
 @app.post("/reset")
 def reset_game():
     _clear_game()
@@ -5,10 +5,13 @@ Konsol oyunu — Python 3.8+
 """
 from __future__ import annotations
 
+import hashlib
 import itertools
+import math
 import random
 import sys
-from typing import List, Tuple, Sequence
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Tuple, Sequence
 
 # -------------------------------
 # Yardımcı veri ve fonksiyonlar
@@ -74,27 +77,141 @@ def feedback(secret: Sequence[str], guess: Sequence[str]) -> Tuple[int, int]:
 def all_codes(length: int, symbols: List[str]) -> List[Tuple[str, ...]]:
     return list(itertools.permutations(symbols, length))
 
+class CodeError(ValueError):
+    """Geçersiz kod; ``reason`` değeri "length", "symbol" veya "duplicate" olur."""
+
+    def __init__(self, reason: str) -> None:
+        super().__init__(reason)
+        self.reason = reason
+
+
+class CodeValidator:
+    """Bir palet için önceden derlenmiş kod doğrulayıcı.
+
+    256 girdilik tablo her karakteri (büyük/küçük harf) palet sırasına
+    eşler; tekrar eden renkler bit maskesiyle yakalanır. Hatalar eski
+    ``parse_guess`` sırasıyla raporlanır: uzunluk, sembol, tekrar.
+    """
+
+    def __init__(self, symbols: Sequence[str]) -> None:
+        self.symbols = tuple(symbols)
+        if len(self.symbols) > 255:
+            raise ValueError("Palet en fazla 255 renk içerebilir.")
+        table = bytearray(256)
+        for idx, sym in enumerate(self.symbols):
+            for ch in (sym, sym.lower(), sym.upper()):
+                if len(ch) == 1 and ord(ch) < 256:
+                    table[ord(ch)] = idx + 1
+        self._table = bytes(table)
+
+    def validate(self, items: Iterable[str], length: int) -> Tuple[str, ...]:
+        """Öğeleri doğrulayıp paletteki sembollerden oluşan kodu döndürür."""
+        if not isinstance(items, (str, list, tuple)):
+            items = list(items)
+        if len(items) != length:
+            raise CodeError("length")
+        table = self._table
+        symbols = self.symbols
+        seen = 0
+        duplicate = False
+        code = []
+        for ch in items:
+            if type(ch) is not str:
+                ch = str(ch)
+            if len(ch) != 1:
+                raise CodeError("symbol")
+            pos = ord(ch)
+            idx = table[pos] if pos < 256 else 0
+            if not idx:
+                raise CodeError("symbol")
+            bit = 1 << idx
+            # Hata sırası korunur: geçersiz sembol, tekrar eden renkten önce raporlanır.
+            duplicate = duplicate or bool(seen & bit)
+            seen |= bit
+            code.append(symbols[idx - 1])
+        if duplicate:
+            raise CodeError("duplicate")
+        return tuple(code)
+
+
+@lru_cache(maxsize=None)
+def _validator(symbols: Tuple[str, ...]) -> CodeValidator:
+    return CodeValidator(symbols)
+
+
+def validator_for(symbols: Sequence[str]) -> CodeValidator:
+    """Palet başına bir kez derlenen doğrulayıcıyı döndürür."""
+    return _validator(tuple(symbols))
+
+
 def parse_guess(raw: str, length: int, allowed: List[str]) -> List[str]:
-    s = (raw or "").strip().upper().replace(" ", "")
-    if len(s) != length:
-        raise ValueError(f"Girdi uzunluğu {length} olmalı.")
-    if any(ch not in allowed for ch in s):
-        raise ValueError(
-            "Geçersiz harf kullanıldı. İzin verilenler: "
-            + ", ".join(f"{c} ({COLOR_NAMES[c]})" for c in allowed)
-        )
-    if len(set(s)) != len(s):
-        raise ValueError("Her rengi en fazla bir kez kullanabilirsin.")
-    return list(s)
+    s = (raw or "").strip().replace(" ", "")
+    try:
+        return list(validator_for(allowed).validate(s, length))
+    except CodeError as e:
+        if e.reason == "length":
+            raise ValueError(f"Girdi uzunluğu {length} olmalı.") from None
+        if e.reason == "symbol":
+            raise ValueError(
+                "Geçersiz harf kullanıldı. İzin verilenler: "
+                + ", ".join(f"{c} ({COLOR_NAMES[c]})" for c in allowed)
+            ) from None
+        raise ValueError("Her rengi en fazla bir kez kullanabilirsin.") from None
 
 def pretty(code: Sequence[str]) -> str:
     return " ".join(code)
 
 
-def generate_secret(length: int, symbols: Sequence[str]) -> Tuple[str, ...]:
+def code_count(length: int, color_count: int) -> int:
+    """Tekrarsız renklerle kurulabilecek kod sayısı: P(renk, uzunluk)."""
+    return math.perm(color_count, length)
+
+
+@lru_cache(maxsize=None)
+def _unrank_blocks(color_count: int, length: int) -> Tuple[int, ...]:
+    # pos. konumdaki bir rakamın kapsadığı kod sayısı: P(n - pos - 1, uzunluk - pos - 1).
+    return tuple(
+        math.perm(color_count - pos - 1, length - pos - 1) for pos in range(length)
+    )
+
+
+def unrank_code(index: int, length: int, symbols: Sequence[str]) -> Tuple[str, ...]:
+    """``index``. kodu (``itertools.permutations`` sırasıyla) döndürür."""
+    pool = list(symbols)
+    code = []
+    for block in _unrank_blocks(len(pool), length):
+        digit, index = divmod(index, block)
+        # Henüz kullanılmamış sembollerden ``digit``. olanı seç.
+        code.append(pool.pop(digit))
+    return tuple(code)
+
+
+def generate_secret(
+    length: int, symbols: Sequence[str], rng: Optional[random.Random] = None
+) -> Tuple[str, ...]:
+    """Tek bir rastgele sayı çekip onu koda çevirir.
+
+    ``rng`` verilmezse modül düzeyindeki ``random`` kullanılır.
+    """
     if length > len(symbols):
         raise ValueError("Gizli kod için yeterli renk yok.")
-    return tuple(random.sample(list(symbols), length))
+    blocks = _unrank_blocks(len(symbols), length)
+    index = (rng or random).randrange(blocks[0] * len(symbols) if blocks else 1)
+    return unrank_code(index, length, symbols)
+
+
+def derive_seed(seed: int, *path: object) -> int:
+    """Ana tohumdan ve bir yoldan (ör. süreç, oyun numarası) bağımsız alt tohum üretir.
+
+    Paralel çalışmalarda her parça kendi ``random.Random(derive_seed(...))``
+    örneğini kullanır; akışlar tekrarlanabilir ve birbirinden bağımsızdır.
+    """
+    key = ":".join(str(part) for part in (seed,) + path).encode("utf-8")
+    return int.from_bytes(hashlib.sha256(key).digest()[:8], "big")
+
+
+def new_seed() -> int:
+    return random.SystemRandom().getrandbits(64)
 
 
 def print_history(entries: List[Tuple[str, Sequence[str], int, int]]) -> None:
@@ -127,31 +244,108 @@ def prompt_secret(owner_name: str, length: int, symbols: List[str]) -> Tuple[str
 # AI Çözücü
 # -------------------------------
 
+@lru_cache(maxsize=16)
+def _code_space(symbols: Tuple[str, ...], length: int) -> Tuple[Tuple[str, ...], ...]:
+    return tuple(itertools.permutations(symbols, length))
+
+
+def _unique_feedback(code: Sequence[str], guess: Sequence[str], guess_set: set) -> Tuple[int, int]:
+    # Renkler tekrarlanmadığında ortak renk sayısı kesişimden hesaplanabilir.
+    exact = sum(1 for a, b in zip(code, guess) if a == b)
+    return exact, len(guess_set.intersection(code)) - exact
+
+
+@lru_cache(maxsize=16)
+def _first_partition(
+    symbols: Tuple[str, ...], length: int
+) -> Dict[Tuple[int, int], Tuple[Tuple[str, ...], ...]]:
+    """``symbols[:length]`` ilk tahmininin kod uzayını geri bildirime göre ayrıştırır."""
+    guess = symbols[:length]
+    guess_set = set(guess)
+    parts: Dict[Tuple[int, int], List[Tuple[str, ...]]] = {}
+    for code in _code_space(symbols, length):
+        parts.setdefault(_unique_feedback(code, guess, guess_set), []).append(code)
+    return {fb: tuple(codes) for fb, codes in parts.items()}
+
+
+@lru_cache(maxsize=16)
+def _code_index(symbols: Tuple[str, ...], length: int) -> Dict[Tuple[str, ...], int]:
+    return {code: idx for idx, code in enumerate(_code_space(symbols, length))}
+
+
+def _first_filter(
+    symbols: Tuple[str, ...], length: int, guess: Tuple[str, ...], fb: Tuple[int, int]
+) -> Tuple[Tuple[str, ...], ...]:
+    # Tekrarsız kodlarda her ilk tahmin, renkleri yeniden adlandırarak önbellekteki
+    # tek ayrıştırmaya dönüşür; yalnızca istenen parça geri çevrilir. Sonuç,
+    # _code_space içindeki ortak demetlere işaret eder ve onun sırasını korur;
+    # böylece oyunlar yalnızca referans tutar, aynı tohum aynı adayları seçer.
+    rest = [c for c in symbols if c not in guess]
+    rename = dict(zip(symbols, guess + tuple(rest)))
+    space = _code_space(symbols, length)
+    index = _code_index(symbols, length)
+    positions = sorted(
+        index[tuple(rename[c] for c in code)]
+        for code in _first_partition(symbols, length).get(fb, ())
+    )
+    return tuple(space[i] for i in positions)
+
+
+class CandidateSet:
+    """Şu ana kadarki geri bildirimlerle hâlâ tutarlı olan kodlar.
+
+    Her geri bildirim yalnızca kalan adayları süzer. İlk tahminin ayrıştırması
+    aynı palet ve uzunluktaki tüm oyunlar arasında önbellekten paylaşılır.
+    """
+
+    def __init__(self, length: int, symbols: Sequence[str]) -> None:
+        self.length = length
+        self.symbols = tuple(symbols)
+        self.codes = _code_space(self.symbols, length)
+        self._fresh = True
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def apply(self, guess: Sequence[str], fb: Tuple[int, int]) -> None:
+        guess = tuple(guess)
+        guess_set = set(guess)
+        if len(guess_set) != len(guess):
+            self.codes = tuple(c for c in self.codes if feedback(c, guess) == fb)
+        elif self._fresh:
+            self.codes = _first_filter(self.symbols, self.length, guess, fb)
+        else:
+            self.codes = tuple(
+                c for c in self.codes if _unique_feedback(c, guess, guess_set) == fb
+            )
+        self._fresh = False
+
+
 class Solver:
-    def __init__(self, length: int, symbols: List[str]):
+    def __init__(self, length: int, symbols: List[str], rng: Optional[random.Random] = None):
         self.length = length
         self.symbols = symbols
-        self.candidates = all_codes(length, symbols)  # Tüm olasılıklar
+        self.rng = rng
+        self.remaining = CandidateSet(length, symbols)  # Tüm olasılıklar
         self.last_guess: Tuple[str, ...] | None = None
 
+    @property
+    def candidates(self) -> Tuple[Tuple[str, ...], ...]:
+        return self.remaining.codes
+
     def next_guess(self) -> Tuple[str, ...]:
         # Basit strateji: adayların ortasından biri (rastgele daha az tekdüze hissettirir)
         # İstersen Knuth 5-adım algoritmasına yakın iyileştirmeler eklenebilir.
         if not self.candidates:
             # Güvenlik: teoride boşalmamalı
-            g = generate_secret(self.length, self.symbols)
+            g = generate_secret(self.length, self.symbols, self.rng)
         else:
-            g = random.choice(self.candidates)
+            g = (self.rng or random).choice(self.candidates)
         self.last_guess = g
         return g
 
     def apply_feedback(self, guess: Sequence[str], fb: Tuple[int, int]) -> None:
-        ex, co = fb
-        new_cands = []
-        for c in self.candidates:
-            if feedback(c, guess) == (ex, co):
-                new_cands.append(c)
-        self.candidates = new_cands
+        self.remaining.apply(guess, tuple(fb))  # type: ignore[arg-type]
 
 # -------------------------------
 # Oyun Modları
@@ -0,0 +1,451 @@
+"""Simüle edilmiş oyuncu kitlesiyle yük testi.
+
+Her sanal oyuncu kendi oturumunda art arda oyun oynar: ``/start`` ile rastgele
+bir mod ve yapılandırma seçer, tahminlerini ``Solver`` ile üretir ve
+hamleler arasında düşünme süresi kadar bekler. Uygulama varsayılan olarak
+Flask test istemcisiyle süreç içinde çalıştırılır; ``--url`` verilirse
+çalışan bir sunucuya HTTP ile bağlanılır.
+
+Süreç içi çalışmada hız sınırları varsayılan olarak kapatılır; böylece
+ölçülen gecikme sınırlayıcının değil uygulamanın kapasitesidir
+(``--keep-rate-limits`` ile açık bırakılır). ``429`` yanıtlarında oyuncu
+``Retry-After`` kadar bekler ve bu yanıtların gecikmesi ayrı raporlanır.
+Oyun belleği ölçümü (``--measure-memory``) gecikmeyi etkilediği için ayrı
+bir çalışmada açılmalıdır.
+
+Kullanım::
+
+    python loadtest.py --players 50 --duration 60 --think-mean 0.5
+    python loadtest.py --players 50 --duration 60 --measure-memory
+    python loadtest.py --url http://127.0.0.1:5000 --players 20
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+from http.cookiejar import CookieJar
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from game import PALETTES, Solver, derive_seed, feedback
+
+MODES = ("player_vs_ai", "pvp_one_by_one", "race_vs_ai", "player_vs_ai_offline")
+LENGTHS = (3, 4, 5, 6)
+
+# Durum kodu, JSON gövde, Retry-After (sn)
+Response = Tuple[int, Dict[str, object], float]
+
+
+def _retry_after(value: Optional[str]) -> float:
+    try:
+        return max(0.0, float(value)) if value else 0.0
+    except ValueError:
+        return 0.0
+
+
+# -----------------------
+# Bağlantılar
+# -----------------------
+class InProcessTransport:
+    """Flask test istemcisi; her sanal oyuncu ayrı bir IP adresinden gelir."""
+
+    def __init__(self, flask_app, remote_addr: str) -> None:
+        self.client = flask_app.test_client()
+        self.environ = {"REMOTE_ADDR": remote_addr}
+
+    def request(self, method: str, path: str, payload: Optional[dict] = None) -> Response:
+        response = self.client.open(
+            path, method=method, json=payload, environ_base=self.environ
+        )
+        return (
+            response.status_code,
+            response.get_json(silent=True) or {},
+            _retry_after(response.headers.get("Retry-After")),
+        )
+
+
+class HttpTransport:
+    def __init__(self, base_url: str) -> None:
+        self.base_url = base_url.rstrip("/")
+        self.opener = urllib.request.build_opener(
+            urllib.request.HTTPCookieProcessor(CookieJar())
+        )
+
+    def request(self, method: str, path: str, payload: Optional[dict] = None) -> Response:
+        data = None if payload is None else json.dumps(payload).encode("utf-8")
+        req = urllib.request.Request(
+            self.base_url + path,
+            data=data,
+            method=method,
+            headers={"Content-Type": "application/json"},
+        )
+        try:
+            with self.opener.open(req, timeout=30) as resp:
+                return resp.status, json.loads(resp.read() or b"{}"), 0.0
+        except urllib.error.HTTPError as exc:
+            try:
+                body = json.loads(exc.read() or b"{}")
+            except ValueError:
+                body = {}
+            return exc.code, body, _retry_after(exc.headers.get("Retry-After"))
+
+
+# -----------------------
+# Ölçümler
+# -----------------------
+class Stats:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        # 429 yanıtları çok hızlı döndüğünden ayrı tutulur; aksi halde yüzdelikleri bozar.
+        self.latencies: Dict[Tuple[str, bool], List[float]] = {}
+        self.statuses: Dict[str, Dict[int, int]] = {}
+        self.games = 0
+        # (zaman, etkin oyun, oyunların toplam boyutu) — boyut yalnızca --measure-memory ile
+        self.samples: List[Tuple[float, int, Optional[int]]] = []
+
+    def record(self, endpoint: str, status: int, seconds: float) -> None:
+        with self._lock:
+            self.latencies.setdefault((endpoint, status == 429), []).append(seconds)
+            counts = self.statuses.setdefault(endpoint, {})
+            counts[status] = counts.get(status, 0) + 1
+
+    def game_done(self) -> None:
+        with self._lock:
+            self.games += 1
+
+
+def percentile(sorted_values: Sequence[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    rank = max(0, min(len(sorted_values) - 1, int(round(pct / 100 * len(sorted_values))) - 1))
+    return sorted_values[rank]
+
+
+def think_time(rng: random.Random, dist: str, mean: float) -> float:
+    if mean <= 0 or dist == "none":
+        return 0.0
+    if dist == "const":
+        return mean
+    if dist == "lognormal":
+        sigma = 0.75
+        return rng.lognormvariate(0.0, sigma) * mean / (2.718281828 ** (sigma * sigma / 2))
+    return rng.expovariate(1 / mean)
+
+
+# -----------------------
+# Sanal oyuncu
+# -----------------------
+class SimulatedPlayer(threading.Thread):
+    def __init__(
+        self,
+        idx: int,
+        transport,
+        stats: Stats,
+        deadline: float,
+        seed: int,
+        think_dist: str,
+        think_mean: float,
+        modes: Sequence[str],
+    ) -> None:
+        super().__init__(name=f"player-{idx}", daemon=True)
+        self.idx = idx
+        self.transport = transport
+        self.stats = stats
+        self.deadline = deadline
+        self.rng = random.Random(derive_seed(seed, "player", idx))
+        self.think_dist = think_dist
+        self.think_mean = think_mean
+        self.modes = modes
+
+    def call(self, endpoint: str, method: str, path: str, payload: Optional[dict] = None) -> Tuple[int, Dict[str, object]]:
+        start = time.perf_counter()
+        status, body, retry_after = self.transport.request(method, path, payload)
+        self.stats.record(endpoint, status, time.perf_counter() - start)
+        if status == 429:
+            self.wait(max(retry_after, 0.1))
+        return status, body
+
+    def wait(self, seconds: float) -> None:
+        if seconds > 0:
+            time.sleep(min(seconds, max(0.0, self.deadline - time.time())))
+
+    def think(self) -> None:
+        self.wait(think_time(self.rng, self.think_dist, self.think_mean))
+
+    def run(self) -> None:
+        while time.time() < self.deadline:
+            self.play_one()
+            self.think()
+
+    def play_one(self) -> None:
+        mode = self.rng.choice(self.modes)
+        color_count = self.rng.choice(sorted(PALETTES))
+        length = self.rng.choice([n for n in LENGTHS if n <= color_count])
+        offline = mode == "player_vs_ai_offline"
+        payload = {
+            "mode": "player_vs_ai" if offline else mode,
+            "length": length,
+            "color_count": color_count,
+            "max_attempts": self.rng.randint(6, 15),
+            "players": [f"Oyuncu {self.idx}", f"Rakip {self.idx}"],
+            "offline": offline,
+        }
+        status, body = self.call("/start", "POST", "/start", payload)
+        state = body.get("state")
+        if status != 200 or not isinstance(state, dict):
+            return
+        symbols = [item["code"] for item in state["palette"]]  # type: ignore[index]
+        solver = Solver(length, symbols, self.rng)
+        if offline:
+            self.play_offline(state, solver)
+        else:
+            self.play_online(state, solver)
+        self.stats.game_done()
+
+    def play_online(self, state: dict, solver: Solver) -> None:
+        while state.get("status") == "ongoing" and time.time() < self.deadline:
+            self.think()
+            if state.get("race") is not None and self.rng.random() < 0.5:
+                # Yarış modunda tarayıcı durumu düzenli olarak sorgular.
+                status, body = self.call("/state", "GET", "/state")
+                state = body.get("state") or state
+                if state.get("status") != "ongoing":
+                    break
+            guess = solver.next_guess()
+            seen = len(state.get("history") or [])
+            status, body = self.call(
+                "/guess",
+                "POST",
+                "/guess",
+                {"guess": list(guess), "player": state.get("active_player")},
+            )
+            new_state = body.get("state")
+            if status != 200 or not isinstance(new_state, dict):
+                if status == 429:
+                    continue
+                return
+            state = new_state
+            history = state.get("history") or []
+            if len(history) <= seen:
+                # Yarışta yapay zekâ tahminden önce kazandıysa tahmin sayılmaz
+                # (200 döner, geçmiş büyümez); önceki kaydın puanı bu tahmine ait değil.
+                continue
+            last = history[-1]
+            if [item["code"] for item in last["guess"]] != list(guess):
+                continue
+            solver.apply_feedback(guess, (last["exact"], last["color_only"]))
+        if state.get("status") == "ongoing":
+            self.call("/reset", "POST", "/reset")
+
+    def play_offline(self, state: dict, solver: Solver) -> None:
+        offline = state["offline"]
+        key = bytes.fromhex(offline["key"])
+        masked = bytes.fromhex(offline["masked"])
+        palette = [item["code"] for item in state["palette"]]
+        secret = tuple(palette[m ^ k] for m, k in zip(masked, key))
+        guesses: List[List[str]] = []
+        scores: List[List[int]] = []
+        for _ in range(state["max_attempts"]):
+            self.think()
+            guess = solver.next_guess()
+            ex, co = feedback(secret, guess)
+            guesses.append(list(guess))
+            scores.append([ex, co])
+            if ex == len(secret):
+                break
+            solver.apply_feedback(guess, (ex, co))
+        self.call("/finish", "POST", "/finish", {"guesses": guesses, "feedback": scores})
+
+
+# -----------------------
+# Çalıştırma
+# -----------------------
+_SKIP_SIZE = (type, type(sys), type(_retry_after), type(len), type(print.__call__), type(Stats().record))
+
+
+def deep_size(objects, seen: Optional[set] = None) -> int:
+    """Nesnelerin ve eriştikleri nesnelerin toplam boyutu (bayt).
+
+    ``seen`` birden çok çağrıda paylaşılırsa oyunlar arasında ortak nesneler
+    (ör. önbellekteki kod uzayı) yalnızca bir kez sayılır.
+    """
+    seen = set() if seen is None else seen
+    total = 0
+    stack = list(objects)
+    while stack:
+        obj = stack.pop()
+        if id(obj) in seen or isinstance(obj, _SKIP_SIZE):
+            continue
+        seen.add(id(obj))
+        total += sys.getsizeof(obj)
+        if isinstance(obj, dict):
+            stack.extend(obj.keys())
+            stack.extend(obj.values())
+        elif isinstance(obj, (list, tuple, set, frozenset)):
+            stack.extend(obj)
+        elif hasattr(obj, "__dict__"):
+            stack.append(vars(obj))
+    return total
+
+
+def _games_size(games: Dict[str, object]) -> Optional[int]:
+    for _ in range(3):
+        try:
+            return deep_size(list(games.values()))
+        except RuntimeError:
+            # Oyun ölçülürken başka bir iş parçacığında değişti; tekrar dene.
+            continue
+    return None
+
+
+def _sampler(
+    transport,
+    stats: Stats,
+    stop: threading.Event,
+    interval: float,
+    started: float,
+    games: Optional[Dict[str, object]],
+) -> None:
+    while True:
+        _, body, _ = transport.request("GET", "/metrics")
+        size = _games_size(games) if games is not None else None
+        stats.samples.append((time.time() - started, int(body.get("active_games", 0)), size))
+        if stop.wait(interval):
+            return
+
+
+def run(
+    *,
+    players: int,
+    duration: float,
+    seed: int,
+    think_dist: str = "exp",
+    think_mean: float = 0.5,
+    modes: Sequence[str] = MODES,
+    url: Optional[str] = None,
+    sample_interval: float = 1.0,
+    keep_rate_limits: bool = False,
+    measure_memory: bool = False,
+) -> Tuple[Stats, float]:
+    games: Optional[Dict[str, object]] = None
+    saved_rules = None
+    if url:
+        make_transport = lambda idx: HttpTransport(url)  # noqa: E731
+    else:
+        import app as app_module
+
+        flask_app = app_module.app
+        make_transport = lambda idx: InProcessTransport(  # noqa: E731
+            flask_app, f"10.{(idx >> 16) & 255}.{(idx >> 8) & 255}.{idx & 255}"
+        )
+        if not keep_rate_limits:
+            saved_rules = app_module._limiter.rules
+            app_module._limiter.rules = {}
+        if measure_memory:
+            games = app_module._games  # type: ignore[assignment]
+
+    stats = Stats()
+    started = time.time()
+    deadline = started + duration
+    stop = threading.Event()
+    sampler = threading.Thread(
+        target=_sampler,
+        args=(make_transport(0), stats, stop, sample_interval, started, games),
+        daemon=True,
+    )
+    sampler.start()
+    workers = [
+        SimulatedPlayer(idx, make_transport(idx + 1), stats, deadline, seed, think_dist, think_mean, modes)
+        for idx in range(players)
+    ]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    elapsed = time.time() - started
+    stop.set()
+    sampler.join()
+    if saved_rules is not None:
+        app_module._limiter.rules = saved_rules
+    return stats, elapsed
+
+
+def print_report(stats: Stats, elapsed: float) -> None:
+    total = sum(len(values) for (_, limited), values in stats.latencies.items() if not limited)
+    limited = sum(len(values) for (_, limited), values in stats.latencies.items() if limited)
+    print(
+        f"Süre: {elapsed:.1f} sn | İstek: {total} (+{limited} x 429) | "
+        f"Verim: {total / elapsed:.1f} istek/sn"
+    )
+    print(f"Tamamlanan oyun: {stats.games} ({stats.games / elapsed:.2f} oyun/sn)")
+    print()
+    print("Uç nokta       | İstek   | p50 (ms) | p95 (ms) | p99 (ms) | Durum kodları")
+    print("-------------- | ------- | -------- | -------- | -------- | -------------")
+    for endpoint, is_limited in sorted(stats.latencies):
+        values = sorted(stats.latencies[(endpoint, is_limited)])
+        label = f"{endpoint} (429)" if is_limited else endpoint
+        codes = ", ".join(f"{code}: {count}" for code, count in sorted(stats.statuses[endpoint].items()))
+        print(
+            f"{label:<14} | {len(values):>7} | {percentile(values, 50) * 1000:>8.2f} | "
+            f"{percentile(values, 95) * 1000:>8.2f} | {percentile(values, 99) * 1000:>8.2f} | "
+            f"{'' if is_limited else codes}"
+        )
+    if stats.samples:
+        print()
+        print("Zaman (sn) | Etkin oyun | Oyun belleği (KB) | Oyun başına (KB)")
+        print("---------- | ---------- | ----------------- | ----------------")
+        step = max(1, len(stats.samples) // 20)
+        for at, games, size in stats.samples[::step] + stats.samples[-1:]:
+            memory = "-" if size is None else f"{size / 1024:.0f}"
+            per_game = "-" if size is None or not games else f"{size / games / 1024:.1f}"
+            print(f"{at:>10.1f} | {games:>10} | {memory:>17} | {per_game:>16}")
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Mastermind sunucusu için yük testi.")
+    parser.add_argument("--players", type=int, default=20, help="Eş zamanlı sanal oyuncu sayısı")
+    parser.add_argument("--duration", type=float, default=30.0, help="Test süresi (sn)")
+    parser.add_argument("--think-mean", type=float, default=0.5, help="Ortalama düşünme süresi (sn)")
+    parser.add_argument(
+        "--think-dist",
+        choices=("exp", "lognormal", "const", "none"),
+        default="exp",
+        help="Düşünme süresi dağılımı",
+    )
+    parser.add_argument("--modes", nargs="+", choices=MODES, default=list(MODES))
+    parser.add_argument("--seed", type=int, default=0, help="Tekrarlanabilir çalışma için tohum")
+    parser.add_argument("--url", help="Süreç içi yerine bu adresteki sunucuyu test et")
+    parser.add_argument("--sample-interval", type=float, default=1.0, help="Örnekleme aralığı (sn)")
+    parser.add_argument(
+        "--keep-rate-limits",
+        action="store_true",
+        help="Süreç içi çalışmada uygulamanın hız sınırlarını açık bırak",
+    )
+    parser.add_argument(
+        "--measure-memory",
+        action="store_true",
+        help="Süreç içi oyunların bellek boyutunu örnekle (gecikmeyi artırır)",
+    )
+    args = parser.parse_args(argv)
+    stats, elapsed = run(
+        players=args.players,
+        duration=args.duration,
+        seed=args.seed,
+        think_dist=args.think_dist,
+        think_mean=args.think_mean,
+        modes=args.modes,
+        url=args.url,
+        sample_interval=args.sample_interval,
+        keep_rate_limits=args.keep_rate_limits,
+        measure_memory=args.measure_memory,
+    )
+    print_report(stats, elapsed)
+
+
+if __name__ == "__main__":
+    main()
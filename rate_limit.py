@@ -0,0 +1,181 @@
+"""Oyun uç noktaları için jeton kovası (token bucket) hız sınırlayıcı.
+
+Kovalar anahtar başına (ör. ``submit_guess:ip:127.0.0.1``) tutulur. Varsayılan arka
+uç süreç içi bellektir; birden çok sürecin aynı sınırları paylaşması için
+SQLite arka ucu kullanılabilir.
+"""
+from __future__ import annotations
+
+import sqlite3
+import threading
+import time
+from collections import Counter, OrderedDict
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Protocol, Sequence, Tuple
+
+
+@dataclass(frozen=True)
+class Rule:
+    """``capacity`` kadar ani istek, ardından saniyede ``rate`` istek."""
+
+    rate: float
+    capacity: float
+
+
+def _refill(tokens: float, updated: float, now: float, rule: Rule) -> float:
+    return min(rule.capacity, tokens + (now - updated) * rule.rate)
+
+
+class Backend(Protocol):
+    def consume(self, keys: Sequence[str], rule: Rule, now: float, cost: float = 1.0) -> float:
+        """Tüm kovalar izin veriyorsa hepsinden jeton harcar.
+
+        İzin verildiyse 0, verilmediyse en uzun bekleme süresini döndürür;
+        reddedilen istek hiçbir kovadan jeton harcamaz.
+        """
+
+
+def _settle(
+    levels: List[Tuple[str, float]], rule: Rule, cost: float
+) -> Tuple[float, List[Tuple[str, float]]]:
+    # Kovalardan biri bile yetmezse hiçbirinden jeton düşülmez.
+    wait = max((cost - tokens) / rule.rate for _, tokens in levels) if levels else 0.0
+    if wait > 0:
+        return wait, levels
+    return 0.0, [(key, tokens - cost) for key, tokens in levels]
+
+
+class MemoryBackend:
+    """Süreç içi kovalar; ``max_keys`` aşılınca en uzun süredir dokunulmayan atılır."""
+
+    def __init__(self, max_keys: int = 100_000) -> None:
+        self.max_keys = max_keys
+        self._buckets: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def consume(self, keys: Sequence[str], rule: Rule, now: float, cost: float = 1.0) -> float:
+        with self._lock:
+            levels = []
+            for key in keys:
+                bucket = self._buckets.get(key)
+                tokens = rule.capacity if bucket is None else _refill(bucket[0], bucket[1], now, rule)
+                levels.append((key, tokens))
+            wait, levels = _settle(levels, rule, cost)
+            for key, tokens in levels:
+                self._buckets[key] = (tokens, now)
+                self._buckets.move_to_end(key)
+            # Atılan kova dolu kabul edilir; etkin (yakın zamanda görülen) kovalar korunur.
+            while len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+            return wait
+
+
+class SQLiteBackend:
+    """Aynı makinedeki süreçler arasında paylaşılan kovalar.
+
+    Tamamen dolmuş kovalar varsayılan durumla aynı olduğundan ``purge_interval``
+    saniyede bir silinir; böylece tablo yalnızca yakın zamanda görülen
+    anahtarları tutar.
+    """
+
+    def __init__(self, path: str, purge_interval: float = 60.0) -> None:
+        self.path = path
+        self.purge_interval = purge_interval
+        self._local = threading.local()
+        # Görülen kurallar içinde boş bir kovanın dolması için gereken en uzun süre.
+        self._max_refill = 0.0
+        self._next_purge = 0.0
+        self._purge_lock = threading.Lock()
+        conn = self._connection()
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS buckets ("
+            " key TEXT PRIMARY KEY, tokens REAL NOT NULL, updated REAL NOT NULL)"
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS buckets_updated ON buckets (updated)")
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5.0, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def consume(self, keys: Sequence[str], rule: Rule, now: float, cost: float = 1.0) -> float:
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            levels = []
+            for key in keys:
+                row = conn.execute(
+                    "SELECT tokens, updated FROM buckets WHERE key = ?", (key,)
+                ).fetchone()
+                levels.append(
+                    (key, rule.capacity if row is None else _refill(row[0], row[1], now, rule))
+                )
+            wait, levels = _settle(levels, rule, cost)
+            conn.executemany(
+                "INSERT INTO buckets (key, tokens, updated) VALUES (?, ?, ?)"
+                " ON CONFLICT(key) DO UPDATE SET tokens = excluded.tokens,"
+                " updated = excluded.updated",
+                [(key, tokens, now) for key, tokens in levels],
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        self._maybe_purge(conn, rule, now)
+        return wait
+
+    def _maybe_purge(self, conn: sqlite3.Connection, rule: Rule, now: float) -> None:
+        with self._purge_lock:
+            self._max_refill = max(self._max_refill, rule.capacity / rule.rate)
+            if now < self._next_purge:
+                return
+            self._next_purge = now + self.purge_interval
+            cutoff = now - self._max_refill
+        # Bu kadar süredir dokunulmamış her kova, boş olsa bile dolmuştur.
+        conn.execute("DELETE FROM buckets WHERE updated < ?", (cutoff,))
+
+
+class RateLimiter:
+    def __init__(self, rules: Dict[str, Rule], backend: Optional[Backend] = None) -> None:
+        self.rules = rules
+        self.backend: Backend = backend or MemoryBackend()
+        self.allowed: Counter = Counter()
+        self.limited: Counter = Counter()
+
+    def check(self, endpoint: str, identities: Iterable[str]) -> float:
+        """Uç nokta için tüm kimliklerin kovasından jeton harcar.
+
+        Kural tanımlı değilse istek serbesttir. Dönen değer 0 ise istek kabul
+        edilmiştir; aksi halde saniye cinsinden bekleme süresidir. Reddedilen
+        istek hiçbir kovadan jeton harcamaz; böylece sınırlanmış bir oturum
+        aynı IP'yi paylaşan diğer oturumların kovasını boşaltmaz.
+        """
+        rule = self.rules.get(endpoint)
+        if rule is None:
+            return 0.0
+        keys = [f"{endpoint}:{identity}" for identity in identities]
+        retry_after = self.backend.consume(keys, rule, time.time())
+        if retry_after:
+            self.limited[endpoint] += 1
+        else:
+            self.allowed[endpoint] += 1
+        return retry_after
+
+    def counters(self) -> Dict[str, Dict[str, int]]:
+        endpoints: List[str] = sorted(set(self.allowed) | set(self.limited))
+        return {
+            name: {"allowed": self.allowed[name], "limited": self.limited[name]}
+            for name in endpoints
+        }
+
+
+DEFAULT_RULES = {
+    # Yeni oyun bellekte yer kapladığı için daha sıkı sınırlanır.
+    "start_game": Rule(rate=0.2, capacity=10),
+    "submit_guess": Rule(rate=5.0, capacity=20),
+    "finish_offline_game": Rule(rate=0.2, capacity=10),
+}
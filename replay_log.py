@@ -0,0 +1,286 @@
+"""Oyun kayıtları için ekleme tabanlı (append-only) ikili olay günlüğü.
+
+Her kayıt sabit boyutlu bir başlık ve uzunluğu başlıkta yazan bir gövdeden
+oluşur. Yazma işlemi istek akışını bekletmemek için arka plandaki bir iş
+parçacığında, kuyrukta biriken olaylar toplu halde yazılarak yapılır.
+"""
+from __future__ import annotations
+
+import logging
+import queue
+import struct
+import threading
+import time
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Dict, Iterator, List, Optional, Sequence, Tuple
+
+if TYPE_CHECKING:  # pragma: no cover
+    from web_game import BaseGame, HistoryEntry
+
+FILE_MAGIC = b"MMEV1\n"
+
+EVENT_START = 1
+EVENT_GUESS = 2
+EVENT_FEEDBACK = 3
+EVENT_END = 4
+
+EVENT_NAMES = {
+    EVENT_START: "start",
+    EVENT_GUESS: "guess",
+    EVENT_FEEDBACK: "feedback",
+    EVENT_END: "end",
+}
+
+# gövde uzunluğu (u16), olay türü (u8), oyun kimliği (16 bayt), zaman damgası (f64)
+_HEADER = struct.Struct("<HB16sd")
+_U8 = struct.Struct("<B")
+_U16 = struct.Struct("<H")
+_U64 = struct.Struct("<Q")
+
+_STOP = object()
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class GameEvent:
+    kind: str
+    game_id: str
+    timestamp: float
+    data: Dict[str, object]
+
+
+# -----------------------
+# Kodlama yardımcıları
+# -----------------------
+def _pack_str(value: str) -> bytes:
+    raw = value.encode("utf-8")[:255]
+    return _U8.pack(len(raw)) + raw
+
+
+def _unpack_str(buf: bytes, pos: int) -> Tuple[str, int]:
+    size = buf[pos]
+    pos += 1
+    return buf[pos:pos + size].decode("utf-8", errors="replace"), pos + size
+
+
+def _encode_body(kind: int, payload: Tuple[object, ...]) -> bytes:
+    if kind == EVENT_START:
+        mode, palette, length, max_attempts, players, seed = payload
+        parts = [
+            _pack_str(mode),
+            _pack_str(palette),
+            _U8.pack(length),
+            _U16.pack(min(max_attempts, 0xFFFF)),
+            _U8.pack(len(players)),
+        ]
+        parts.extend(_pack_str(name) for name in players)
+        parts.append(_U64.pack(seed))
+        return b"".join(parts)
+    if kind == EVENT_GUESS:
+        player, code = payload
+        return _pack_str(player) + _pack_str(code)
+    if kind == EVENT_FEEDBACK:
+        exact, color_only = payload
+        return _U8.pack(exact) + _U8.pack(color_only)
+    if kind == EVENT_END:
+        status, winner, secret, guesses = payload
+        return (
+            _pack_str(status)
+            + _pack_str(winner)
+            + _pack_str(secret)
+            + _U16.pack(min(guesses, 0xFFFF))
+        )
+    raise ValueError(f"Bilinmeyen olay türü: {kind}")
+
+
+def _decode_body(kind: int, body: bytes) -> Dict[str, object]:
+    if kind == EVENT_START:
+        mode, pos = _unpack_str(body, 0)
+        palette, pos = _unpack_str(body, pos)
+        length = body[pos]
+        (max_attempts,) = _U16.unpack_from(body, pos + 1)
+        count = body[pos + 3]
+        pos += 4
+        players: List[str] = []
+        for _ in range(count):
+            name, pos = _unpack_str(body, pos)
+            players.append(name)
+        seed = _U64.unpack_from(body, pos)[0] if len(body) >= pos + _U64.size else None
+        return {
+            "mode": mode,
+            "palette": palette,
+            "color_count": len(palette),
+            "length": length,
+            "max_attempts": max_attempts,
+            "players": players,
+            "seed": seed,
+        }
+    if kind == EVENT_GUESS:
+        player, pos = _unpack_str(body, 0)
+        code, _ = _unpack_str(body, pos)
+        return {"player": player, "guess": tuple(code)}
+    if kind == EVENT_FEEDBACK:
+        return {"exact": body[0], "color_only": body[1]}
+    if kind == EVENT_END:
+        status, pos = _unpack_str(body, 0)
+        winner, pos = _unpack_str(body, pos)
+        secret, pos = _unpack_str(body, pos)
+        (guesses,) = _U16.unpack_from(body, pos)
+        return {
+            "status": status,
+            "winner": winner or None,
+            "secret": tuple(secret),
+            "guesses": guesses,
+        }
+    return {}
+
+
+def encode_event(kind: int, game_id: str, timestamp: float, payload: Tuple[object, ...]) -> bytes:
+    body = _encode_body(kind, payload)
+    return _HEADER.pack(len(body), kind, bytes.fromhex(game_id), timestamp) + body
+
+
+# -----------------------
+# Yazıcı
+# -----------------------
+class EventLogWriter:
+    """Olayları kuyruğa alır ve arka planda toplu halde dosyaya ekler.
+
+    İstek tarafında yalnızca ham değerler kuyruğa konur; kodlama ve disk
+    yazımı arka plan iş parçacığında yapılır. Kuyruk dolarsa olay bekletilmeden
+    atılır ve ``dropped`` sayacı artırılır.
+    """
+
+    def __init__(self, path: str, *, batch_size: int = 512, max_queue: int = 100_000) -> None:
+        self.path = path
+        self.batch_size = batch_size
+        self.dropped = 0
+        self.written = 0
+        self._queue: "queue.Queue[object]" = queue.Queue(maxsize=max_queue)
+        self._closed = False
+        self._thread = threading.Thread(
+            target=self._run, name="mastermind-event-log", daemon=True
+        )
+        self._thread.start()
+
+    def _emit(self, kind: int, game_id: str, payload: Tuple[object, ...]) -> None:
+        if self._closed:
+            return
+        try:
+            self._queue.put_nowait((kind, game_id, time.time(), payload))
+        except queue.Full:
+            self.dropped += 1
+
+    def log_start(self, game: "BaseGame") -> None:
+        players = tuple(str(p["name"]) for p in game.players_summary())
+        self._emit(
+            EVENT_START,
+            game.game_id,
+            (
+                game.mode_key,
+                "".join(game.symbols),
+                game.length,
+                game.max_attempts,
+                players,
+                game.seed,
+            ),
+        )
+
+    def log_guess(self, game: "BaseGame", entry: "HistoryEntry") -> None:
+        self._emit(EVENT_GUESS, game.game_id, (entry.player, "".join(entry.guess)))
+        self._emit(EVENT_FEEDBACK, game.game_id, (entry.exact, entry.color_only))
+
+    def log_end(self, game: "BaseGame", status: Optional[str] = None) -> None:
+        secret: Sequence[str] = getattr(game, "secret", ())
+        self._emit(
+            EVENT_END,
+            game.game_id,
+            (status or game.status, game.winner or "", "".join(secret), len(game.history)),
+        )
+
+    def close(self, timeout: Optional[float] = None) -> None:
+        """Kuyruktaki olayları yazıp iş parçacığını durdurur."""
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
+
+    def _run(self) -> None:
+        try:
+            fh = open(self.path, "ab")
+            if fh.tell() == 0:
+                fh.write(FILE_MAGIC)
+                fh.flush()
+        except OSError:
+            logger.exception("Olay günlüğü açılamadı: %s", self.path)
+            fh = None
+        stop = False
+        try:
+            while not stop:
+                item = self._queue.get()
+                batch = []
+                while True:
+                    if item is _STOP:
+                        stop = True
+                        break
+                    kind, game_id, timestamp, payload = item  # type: ignore[misc]
+                    try:
+                        batch.append(encode_event(kind, game_id, timestamp, payload))
+                    except Exception:
+                        logger.exception("Olay kodlanamadı, atlanıyor (oyun %s).", game_id)
+                        self.dropped += 1
+                    if len(batch) >= self.batch_size:
+                        break
+                    try:
+                        item = self._queue.get_nowait()
+                    except queue.Empty:
+                        break
+                if not batch:
+                    continue
+                # Dosya açılamadıysa kuyruk yine boşaltılır; olaylar atılmış sayılır.
+                if fh is None:
+                    self.dropped += len(batch)
+                    continue
+                try:
+                    fh.write(b"".join(batch))
+                    fh.flush()
+                    self.written += len(batch)
+                except OSError:
+                    logger.exception("Olay günlüğüne yazılamadı: %s", self.path)
+                    self.dropped += len(batch)
+        finally:
+            if fh is not None:
+                fh.close()
+
+
+# -----------------------
+# Okuyucu
+# -----------------------
+def read_events(path: str) -> Iterator[GameEvent]:
+    """Günlükteki olayları dosyayı belleğe almadan tek tek döndürür.
+
+    Yazım sırasında kesilmiş son kayıt sessizce atlanır.
+    """
+    with open(path, "rb") as fh:
+        magic = fh.read(len(FILE_MAGIC))
+        if not magic:
+            return
+        if magic != FILE_MAGIC:
+            raise ValueError(f"{path}: geçerli bir olay günlüğü değil.")
+        header_size = _HEADER.size
+        while True:
+            header = fh.read(header_size)
+            if len(header) < header_size:
+                return
+            body_len, kind, raw_id, timestamp = _HEADER.unpack(header)
+            body = fh.read(body_len)
+            if len(body) < body_len:
+                return
+            yield GameEvent(
+                kind=EVENT_NAMES.get(kind, "unknown"),
+                game_id=raw_id.hex(),
+                timestamp=timestamp,
+                data=_decode_body(kind, body),
+            )
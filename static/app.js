@@ -1,5 +1,6 @@
 (() => {
   const COLOR_MAP = window.COLOR_NAMES || {};
+  const RECOMMENDED = window.RECOMMENDED_ATTEMPTS || {};
 
   const paletteEl = document.getElementById('palette');
   const currentGuessEl = document.getElementById('current-guess');
@@ -11,6 +12,7 @@
   const badgeEl = document.getElementById('game-status');
   const turnInfoEl = document.getElementById('turn-info');
   const attemptInfoEl = document.getElementById('attempt-info');
+  const raceInfoEl = document.getElementById('race-info');
   const secretPanelEl = document.getElementById('secret-panel');
   const secretCodeEl = document.getElementById('secret-code');
   const secretTextEl = document.getElementById('secret-text');
@@ -20,16 +22,49 @@
   const configForm = document.getElementById('config-form');
   const modeSelect = document.getElementById('mode');
   const playerTwoGroup = document.getElementById('player-two-group');
+  const offlineGroup = document.getElementById('offline-group');
+  const colorCountInput = document.getElementById('color-count');
+  const lengthInput = document.getElementById('code-length');
+  const attemptsInput = document.getElementById('max-attempts');
+  const attemptHintEl = document.getElementById('attempt-hint');
+  const OFFLINE_STORAGE_PREFIX = 'mastermind-offline-';
 
   let currentGuess = [];
   let currentState = null;
+  let racePollTimer = null;
+  let offlineSession = null;
 
   function handleModeChange() {
-    if (modeSelect.value === 'player_vs_ai') {
+    if (modeSelect.value === 'player_vs_ai' || modeSelect.value === 'race_vs_ai') {
       playerTwoGroup.style.display = 'none';
     } else {
       playerTwoGroup.style.display = 'flex';
     }
+    offlineGroup.style.display = modeSelect.value === 'player_vs_ai' ? 'flex' : 'none';
+  }
+
+  function updateAttemptHint() {
+    const entry = RECOMMENDED[`${colorCountInput.value}x${lengthInput.value}`];
+    if (!entry) {
+      attemptHintEl.textContent = '';
+      attemptHintEl.classList.remove('warning');
+      return;
+    }
+    const worstCase = entry.worst_case;
+    const tooFew = Number(attemptsInput.value) < worstCase;
+    let text;
+    if (entry.exact) {
+      text = tooFew
+        ? `En iyi oyun bile ${worstCase} denemeye kadar gerektirebilir.`
+        : `En iyi oyunla en fazla ${worstCase} denemede çözülür.`;
+    } else {
+      // Tablodaki değer açgözlü bir stratejiden gelir; en iyi oyun için yalnızca üst sınırdır.
+      text = tooFew
+        ? `Bilinen bir strateji ${worstCase} denemeye kadar gerektirebilir; en iyi oyun daha azıyla yetinebilir.`
+        : `Bilinen bir stratejiyle en fazla ${worstCase} denemede çözülür.`;
+    }
+    attemptHintEl.textContent = text;
+    attemptHintEl.classList.toggle('warning', tooFew && entry.exact);
   }
 
   function fetchState() {
@@ -40,8 +75,235 @@
   }
 
   function updateState(state, errorText = '') {
-    currentState = state;
+    if (state && state.offline && state.offline.key && state.status === 'ongoing') {
+      resumeOffline(state);
+      currentState = buildOfflineState();
+    } else {
+      offlineSession = null;
+      currentState = state;
+    }
     renderState(errorText);
+    scheduleRacePoll();
+    if (offlineSession && offlineSession.finished) {
+      finishOffline();
+    }
+  }
+
+  // -----------------------
+  // Çevrimdışı oyun
+  // -----------------------
+
+  // game.py içindeki feedback fonksiyonunun karşılığı.
+  function scoreGuess(secret, guess) {
+    const n = secret.length;
+    const usedSecret = new Array(n).fill(false);
+    const usedGuess = new Array(n).fill(false);
+    let exact = 0;
+    for (let i = 0; i < n; i += 1) {
+      if (guess[i] === secret[i]) {
+        exact += 1;
+        usedSecret[i] = true;
+        usedGuess[i] = true;
+      }
+    }
+    let colorOnly = 0;
+    for (let i = 0; i < n; i += 1) {
+      if (usedGuess[i]) {
+        continue;
+      }
+      for (let j = 0; j < n; j += 1) {
+        if (usedSecret[j]) {
+          continue;
+        }
+        if (guess[i] === secret[j]) {
+          colorOnly += 1;
+          usedSecret[j] = true;
+          usedGuess[i] = true;
+          break;
+        }
+      }
+    }
+    return [exact, colorOnly];
+  }
+
+  function hexToBytes(hex) {
+    const bytes = [];
+    for (let i = 0; i < hex.length; i += 2) {
+      bytes.push(parseInt(hex.slice(i, i + 2), 16));
+    }
+    return bytes;
+  }
+
+  function resumeOffline(state) {
+    const offline = state.offline;
+    if (offlineSession && offlineSession.gameId === offline.game_id) {
+      offlineSession.base = state;
+      return;
+    }
+    const key = hexToBytes(offline.key);
+    const secret = hexToBytes(offline.masked).map(
+      (value, idx) => state.palette[value ^ key[idx]].code,
+    );
+    let saved = null;
+    try {
+      saved = JSON.parse(localStorage.getItem(OFFLINE_STORAGE_PREFIX + offline.game_id));
+    } catch (err) {
+      saved = null;
+    }
+    offlineSession = {
+      gameId: offline.game_id,
+      base: state,
+      secret,
+      // Oyun başında alınan taahhüt saklanır; salt oyun bitince gelir.
+      commitment: (saved && saved.commitment) || offline.commitment,
+      guesses: saved && Array.isArray(saved.guesses) ? saved.guesses : [],
+      feedback: saved && Array.isArray(saved.feedback) ? saved.feedback : [],
+      finished: false,
+      finishing: false,
+    };
+    offlineSession.finished = isOfflineFinished();
+  }
+
+  function verifyCommitment(session, offline) {
+    if (!offline || !offline.salt || !window.crypto || !window.crypto.subtle) {
+      return;
+    }
+    const data = new TextEncoder().encode(`${offline.salt}:${session.secret.join('')}`);
+    window.crypto.subtle.digest('SHA-256', data).then((digest) => {
+      const hex = Array.from(new Uint8Array(digest))
+        .map((b) => b.toString(16).padStart(2, '0'))
+        .join('');
+      if (hex !== session.commitment) {
+        flashMessage('Gizli kod taahhüdü doğrulanamadı.');
+      }
+    });
+  }
+
+  function isOfflineFinished() {
+    const session = offlineSession;
+    const last = session.feedback[session.feedback.length - 1];
+    const won = Boolean(last) && last[0] === session.base.length;
+    return won || session.guesses.length >= session.base.max_attempts;
+  }
+
+  function saveOffline() {
+    try {
+      localStorage.setItem(
+        OFFLINE_STORAGE_PREFIX + offlineSession.gameId,
+        JSON.stringify({
+          commitment: offlineSession.commitment,
+          guesses: offlineSession.guesses,
+          feedback: offlineSession.feedback,
+        }),
+      );
+    } catch (err) {
+      // Depolama kapalıysa oyun yine de sayfa açık kaldıkça sürer.
+    }
+  }
+
+  function buildOfflineState() {
+    const session = offlineSession;
+    const base = session.base;
+    const playerName = base.players.length ? base.players[0].name : '';
+    const remaining = base.max_attempts - session.guesses.length;
+    const state = { ...base };
+    state.history = session.guesses.map((guess, idx) => ({
+      index: idx + 1,
+      player: playerName,
+      guess: guess.map((code) => ({ code, name: COLOR_MAP[code] || code })),
+      exact: session.feedback[idx][0],
+      color_only: session.feedback[idx][1],
+    }));
+    state.attempts_left = remaining;
+    state.players = base.players.map((player) => ({ ...player, remaining }));
+    const last = session.feedback[session.feedback.length - 1];
+    if (session.finished) {
+      state.message = 'Sonuç sunucuya gönderiliyor...';
+      state.active_player = null;
+    } else if (last) {
+      state.message = `Tam isabet: ${last[0]}, doğru renk: ${last[1]}. ${remaining} deneme kaldı.`;
+    }
+    return state;
+  }
+
+  function submitOfflineGuess() {
+    const session = offlineSession;
+    const guess = currentGuess.slice();
+    session.guesses.push(guess);
+    session.feedback.push(scoreGuess(session.secret, guess));
+    session.finished = isOfflineFinished();
+    saveOffline();
+    currentGuess = [];
+    currentState = buildOfflineState();
+    renderState();
+    if (session.finished) {
+      finishOffline();
+    }
+  }
+
+  function finishOffline() {
+    const session = offlineSession;
+    if (!session || session.finishing) {
+      return;
+    }
+    session.finishing = true;
+    fetch('/finish', {
+      method: 'POST',
+      headers: { 'Content-Type': 'application/json' },
+      body: JSON.stringify({ guesses: session.guesses, feedback: session.feedback }),
+    })
+      .then(async (response) => {
+        const data = await response.json().catch(() => ({}));
+        if (response.status === 429) {
+          // Sunucudaki oyun sürüyor; yerel geçmiş korunur ve gönderim yinelenir.
+          const wait = Number(response.headers.get('Retry-After')) || 5;
+          session.finishing = false;
+          flashMessage(`Çok fazla istek gönderildi; sonuç ${wait} sn sonra tekrar gönderilecek.`);
+          setTimeout(() => {
+            if (offlineSession === session) {
+              finishOffline();
+            }
+          }, wait * 1000);
+          return;
+        }
+        if (!response.ok) {
+          session.finishing = false;
+          if (data.state && data.state.status !== 'ongoing') {
+            // Sunucu oyunu zaten kapatmış; saklanan geçmişin gönderilecek yeri kalmadı.
+            localStorage.removeItem(OFFLINE_STORAGE_PREFIX + session.gameId);
+            offlineSession = null;
+            updateState(data.state, data.error || 'Sonuç doğrulanamadı.');
+          } else {
+            flashMessage(data.error || 'Sonuç gönderilemedi. Sayfayı yenileyerek tekrar dene.');
+          }
+          return;
+        }
+        localStorage.removeItem(OFFLINE_STORAGE_PREFIX + session.gameId);
+        offlineSession = null;
+        const verification = data.verification || {};
+        updateState(
+          data.state || null,
+          verification.consistent === false ? 'Geri bildirimler sunucuyla uyuşmadı; sonuç geçersiz.' : '',
+        );
+        if (data.state) {
+          verifyCommitment(session, data.state.offline);
+        }
+      })
+      .catch(() => {
+        session.finishing = false;
+        flashMessage('Sonuç gönderilemedi. Sayfayı yenileyerek tekrar dene.');
+      });
+  }
+
+  function scheduleRacePoll() {
+    if (racePollTimer) {
+      clearTimeout(racePollTimer);
+      racePollTimer = null;
+    }
+    if (!currentState || !currentState.race || currentState.status !== 'ongoing') {
+      return;
+    }
+    racePollTimer = setTimeout(fetchState, 2000);
   }
 
   function renderState(errorText = '') {
@@ -52,6 +314,8 @@
       statusMessageEl.classList.toggle('error', Boolean(errorText));
       turnInfoEl.textContent = '';
       attemptInfoEl.innerHTML = '';
+      raceInfoEl.hidden = true;
+      raceInfoEl.textContent = '';
       paletteEl.innerHTML = '';
       historyBodyEl.innerHTML = '';
       historyEmptyEl.hidden = false;
@@ -70,6 +334,7 @@
       ongoing: { text: 'Devam ediyor', class: 'badge' },
       won: { text: 'Kazandın', class: 'badge' },
       lost: { text: 'Oyun bitti', class: 'badge' },
+      rejected: { text: 'Geçersiz', class: 'badge' },
     };
     const statusInfo = statusMap[state.status] || statusMap.ongoing;
     badgeEl.textContent = statusInfo.text;
@@ -79,6 +344,7 @@
     statusMessageEl.classList.toggle('error', Boolean(errorText));
 
     renderPlayers(state);
+    renderRace(state);
     renderPalette(state);
     renderHistory(state);
     renderSecret(state);
@@ -121,6 +387,24 @@
     attemptInfoEl.appendChild(wrapper);
   }
 
+  function renderRace(state) {
+    const race = state.race;
+    if (!race) {
+      raceInfoEl.hidden = true;
+      raceInfoEl.textContent = '';
+      return;
+    }
+    raceInfoEl.hidden = false;
+    const parts = [
+      `Kalan olası kod: ${race.candidates_left}`,
+      `Yapay zekâ tahmini: ${race.ai_guesses}`,
+    ];
+    if (race.next_ai_move_in !== null && race.next_ai_move_in !== undefined) {
+      parts.push(`Sonraki hamle: ${Math.ceil(race.next_ai_move_in)} sn`);
+    }
+    raceInfoEl.textContent = parts.join(' · ');
+  }
+
   function renderPalette(state) {
     paletteEl.innerHTML = '';
     if (!Array.isArray(state.palette)) {
@@ -254,7 +538,11 @@
   }
 
   function updateControls() {
-    const ready = Boolean(currentState && currentState.status === 'ongoing');
+    const ready = Boolean(
+      currentState
+        && currentState.status === 'ongoing'
+        && !(offlineSession && offlineSession.finished),
+    );
     undoBtn.disabled = !ready || currentGuess.length === 0;
     submitBtn.disabled = !ready || currentGuess.length !== (currentState ? currentState.length : 0);
   }
@@ -282,6 +570,12 @@
       flashMessage('Tahmin eksik. Tüm renkleri seçmelisin.');
       return;
     }
+    if (offlineSession) {
+      if (!offlineSession.finished) {
+        submitOfflineGuess();
+      }
+      return;
+    }
     fetch('/guess', {
       method: 'POST',
       headers: {
@@ -316,9 +610,10 @@
       length: Number(formData.get('length')),
       color_count: Number(formData.get('color_count')),
       max_attempts: Number(formData.get('max_attempts')),
+      offline: mode === 'player_vs_ai' && formData.get('offline') === 'on',
       players: [],
     };
-    if (mode === 'player_vs_ai') {
+    if (mode === 'player_vs_ai' || mode === 'race_vs_ai') {
       payload.players.push(formData.get('player1') || '');
     } else {
       payload.players.push(formData.get('player1') || '');
@@ -345,6 +640,9 @@
   }
 
   function resetGame() {
+    if (offlineSession) {
+      localStorage.removeItem(OFFLINE_STORAGE_PREFIX + offlineSession.gameId);
+    }
     fetch('/reset', { method: 'POST' })
       .then(() => {
         currentGuess = [];
@@ -358,7 +656,11 @@
   resetBtn.addEventListener('click', resetGame);
   configForm.addEventListener('submit', startGame);
   modeSelect.addEventListener('change', handleModeChange);
+  [colorCountInput, lengthInput, attemptsInput].forEach((input) => {
+    input.addEventListener('input', updateAttemptHint);
+  });
 
   handleModeChange();
+  updateAttemptHint();
   fetchState();
 })();
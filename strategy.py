@@ -0,0 +1,526 @@
+"""Yapılandırma başına en iyi stratejinin en kötü ve ortalama tahmin sayıları.
+
+Her (renk sayısı, kod uzunluğu) için geri bildirim bölümleme ağacında dal
+ve sınır (branch and bound) araması yapılır:
+
+- ``worst_case``: en iyi oyunla her gizli kodu garanti çözen en az tahmin sayısı,
+- ``average``: tüm gizli kodlar üzerinden en küçük ortalama tahmin sayısı.
+
+Tekrarsız kodlarda tüm ilk tahminler simetriktir; bu yüzden ilk tahmin
+sabitlenir ve ilk geri bildirimin oluşturduğu her alt ağaç ayrı bir süreçte
+çözülür. Biten alt ağaçlar ara kayıt dosyasına yazılır; yarıda kalan bir
+çalışma kaldığı yerden sürer. ``EXACT_CONFIGS`` dışındaki yapılandırmalar
+için tam arama yerine açgözlü bir stratejinin değerleri (``exact: false``,
+yani üst sınır) yazılır. Her kayıt hangi yöntemle hesaplandığını
+``method`` alanında taşır.
+
+Kullanım::
+
+    python strategy.py --processes 8
+    python strategy.py --config 6x6 --exact 6x6 --processes 8
+"""
+from __future__ import annotations
+
+import argparse
+import itertools
+import json
+import math
+import multiprocessing
+import os
+import random
+from functools import lru_cache
+from operator import itemgetter
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from game import PALETTES, derive_seed
+
+TABLE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "strategy_table.json")
+SUPPORTED_LENGTHS = range(3, 7)
+# Tam aramanın tek çekirdekte makul sürede bittiği yapılandırmalar. 6x6 ve 8x4
+# kod sayısı olarak küçük olsa da bir saatte bitmedi; --exact ile eklenebilir.
+EXACT_CONFIGS = frozenset({(6, 3), (6, 4), (6, 5), (8, 3)})
+GREEDY_POOL = 100
+
+Part = Tuple[int, ...]
+
+
+def config_key(color_count: int, length: int) -> str:
+    return f"{color_count}x{length}"
+
+
+# -----------------------
+# Geri bildirim tablosu
+# -----------------------
+class Space:
+    """Bir yapılandırmanın kodları ve kod çiftleri arasındaki geri bildirimler.
+
+    Geri bildirim ``tam * (uzunluk + 1) + renk`` olarak tek bayta kodlanır.
+    Tablo yalnızca ``build_table`` ile, yani tam arama için oluşturulur.
+    """
+
+    def __init__(self, color_count: int, length: int, build_table: bool = True) -> None:
+        self.color_count = color_count
+        self.length = length
+        self.codes = list(itertools.permutations(PALETTES[color_count], length))
+        self.solved = length * (length + 1)
+        self.rows: List[bytes] = []
+        self.branching = 0
+        if build_table:
+            self.rows = [self._row(guess) for guess in self.codes]
+            # Çözülmemiş durumda bir tahminin alabileceği en fazla farklı geri bildirim.
+            self.branching = len(set(itertools.chain.from_iterable(self.rows))) - 1
+
+    def score(self, code: Sequence[str], guess: Sequence[str], guess_set: set) -> int:
+        exact = sum(1 for a, b in zip(code, guess) if a == b)
+        return exact * (self.length + 1) + len(guess_set.intersection(code)) - exact
+
+    def _row(self, guess: Tuple[str, ...]) -> bytes:
+        guess_set = set(guess)
+        return bytes(self.score(code, guess, guess_set) for code in self.codes)
+
+    def partition(self, part: Part, guess: int) -> Dict[int, List[int]]:
+        row = self.rows[guess]
+        parts: Dict[int, List[int]] = {}
+        for idx in part:
+            parts.setdefault(row[idx], []).append(idx)
+        return parts
+
+
+@lru_cache(maxsize=4)
+def _space(color_count: int, length: int) -> Space:
+    return Space(color_count, length)
+
+
+# -----------------------
+# Tam arama
+# -----------------------
+class ExactSearch:
+    """Bir alt kümedeki kodları çözmek için gereken en iyi değerleri arar.
+
+    Budanan aramalar kesin değer değil alt sınır döndürür; bunlar ayrı bir
+    sözlükte tutulur ve yalnızca budama kararlarında kullanılır.
+    """
+
+    def __init__(self, space: Space) -> None:
+        self.space = space
+        self.guesses = range(len(space.codes))
+        self._total_floor: Dict[int, int] = {}
+        self._total: Dict[Part, int] = {}
+        self._total_lb: Dict[Part, int] = {}
+        self._depth: Dict[Part, int] = {}
+        self._depth_lb: Dict[Part, int] = {}
+
+    def _options(
+        self, part: Part, guesses: Optional[Sequence[int]] = None
+    ) -> List[Tuple[int, List[Part], bool]]:
+        """Birbirinden farklı bölümleme üreten tahminler (etkisiz olanlar hariç)."""
+        members = set(part)
+        seen = set()
+        options = []
+        rows = self.space.rows
+        solved = self.space.solved
+        pick = itemgetter(*part)
+        for guess in self.guesses if guesses is None else guesses:
+            signature = pick(rows[guess])
+            if signature in seen:
+                continue
+            seen.add(signature)
+            parts: Dict[int, List[int]] = {}
+            for idx, fb in zip(part, signature):
+                parts.setdefault(fb, []).append(idx)
+            hit = guess in members
+            rest = [tuple(p) for fb, p in parts.items() if fb != solved]
+            if not hit and len(rest) == 1:
+                continue
+            rest.sort(key=len, reverse=True)
+            options.append((guess, rest, hit))
+        return options
+
+    # Toplam tahmin (ortalama * kod sayısı)
+    def _total_bound(self, size: int) -> int:
+        # d. tahminde en fazla B^(d-1) kod bulunabilir (B: dallanma sayısı).
+        floor = self._total_floor.get(size)
+        if floor is None:
+            floor = 0
+            remaining = size
+            level = 1
+            width = 1
+            while remaining > 0:
+                found = min(remaining, width)
+                floor += found * level
+                remaining -= found
+                level += 1
+                width *= self.space.branching
+            self._total_floor[size] = floor
+        return floor
+
+    def _depth_bound(self, size: int) -> int:
+        level = 1
+        reach = 1
+        width = 1
+        while reach < size:
+            width *= self.space.branching
+            reach += width
+            level += 1
+        return level
+
+    def total(
+        self, part: Part, bound: float = math.inf, guesses: Optional[Sequence[int]] = None
+    ) -> int:
+        size = len(part)
+        if size == 1:
+            return 1
+        if size == 2:
+            return 3
+        if part in self._total:
+            return self._total[part]
+        lower = max(self._total_bound(size), self._total_lb.get(part, 0))
+        if lower >= bound:
+            return lower
+
+        options = []
+        for guess, rest, hit in self._options(part, guesses):
+            lb = size + sum(self._total_bound(len(p)) for p in rest)
+            options.append((lb, guess, rest))
+        options.sort(key=lambda item: item[0])
+
+        best = bound
+        for lb, _guess, rest in options:
+            if lb >= best:
+                break
+            acc = size
+            remaining_lb = lb - size
+            for p in rest:
+                remaining_lb -= self._total_bound(len(p))
+                acc += self.total(p, best - acc - remaining_lb)
+                if acc + remaining_lb >= best:
+                    break
+            else:
+                best = acc
+        if best < bound:
+            self._total[part] = int(best)
+            return int(best)
+        self._total_lb[part] = max(lower, int(min(bound, best)))
+        return self._total_lb[part]
+
+    # En kötü durum
+    def depth(
+        self, part: Part, bound: float = math.inf, guesses: Optional[Sequence[int]] = None
+    ) -> int:
+        size = len(part)
+        if size == 1:
+            return 1
+        if size == 2:
+            return 2
+        if part in self._depth:
+            return self._depth[part]
+        lower = max(self._depth_bound(size), self._depth_lb.get(part, 0))
+        if lower >= bound:
+            return lower
+
+        options = self._options(part, guesses)
+        options.sort(key=lambda item: len(item[1][0]) if item[1] else 0)
+        best = bound
+        for _guess, rest, hit in options:
+            if not rest:
+                best = 1
+                break
+            worst = 1
+            for p in rest:
+                worst = max(worst, 1 + self.depth(p, best - 1))
+                if worst >= best:
+                    break
+            else:
+                best = worst
+            if best <= lower:
+                break
+        if best < bound:
+            self._depth[part] = int(best)
+            return int(best)
+        self._depth_lb[part] = max(lower, int(min(bound, best)))
+        return self._depth_lb[part]
+
+
+def _root_parts(space: Space) -> Dict[int, Part]:
+    # Tüm ilk tahminler simetrik olduğundan ilk kod seçilir.
+    parts = space.partition(tuple(range(len(space.codes))), 0)
+    return {fb: tuple(p) for fb, p in parts.items() if fb != space.solved}
+
+
+@lru_cache(maxsize=4)
+def _second_guesses(color_count: int, length: int) -> Tuple[int, ...]:
+    """İlk tahminden sonra simetri bakımından birbirinden farklı tahminler.
+
+    İlk tahmini koruyan dönüşümler (konumların yer değiştirmesi ve ilk
+    tahminde kullanılmayan renklerin kendi aralarında değişmesi) ilk geri
+    bildirimin her alt kümesini de korur. Bu nedenle alt ağacın kökünde her
+    denklik sınıfından tek bir tahmin denemek yeterlidir.
+    """
+    space = _space(color_count, length)
+    first = space.codes[0]
+    unused = [c for c in PALETTES[color_count] if c not in first]
+    index = {code: i for i, code in enumerate(space.codes)}
+    maps = []
+    for order in itertools.permutations(range(length)):
+        for shuffled in itertools.permutations(unused):
+            colors = {first[k]: first[order[k]] for k in range(length)}
+            colors.update(zip(unused, shuffled))
+            maps.append((order, colors))
+    seen = set()
+    reps = []
+    for i, code in enumerate(space.codes):
+        if i in seen:
+            continue
+        reps.append(i)
+        for order, colors in maps:
+            image = [""] * length
+            for k in range(length):
+                image[order[k]] = colors[code[k]]
+            seen.add(index[tuple(image)])
+    return tuple(reps)
+
+
+def _search_job(job: Tuple[int, int, int]) -> Tuple[str, int, int, int]:
+    color_count, length, fb = job
+    space = _space(color_count, length)
+    part = _root_parts(space)[fb]
+    guesses = _second_guesses(color_count, length)
+    search = ExactSearch(space)
+    return (
+        config_key(color_count, length),
+        fb,
+        search.total(part, guesses=guesses),
+        search.depth(part, guesses=guesses),
+    )
+
+
+# -----------------------
+# Açgözlü üst sınır
+# -----------------------
+def greedy_values(color_count: int, length: int, seed: int = 0) -> Tuple[int, int]:
+    """Beklenen kalan küme boyutunu en aza indiren stratejinin toplamı ve derinliği."""
+    space = Space(color_count, length, build_table=False)
+    rng = random.Random(derive_seed(seed, "greedy", color_count, length))
+    codes = space.codes
+
+    def split(part: Sequence[int], guess: int) -> Dict[int, List[int]]:
+        g = codes[guess]
+        g_set = set(g)
+        parts: Dict[int, List[int]] = {}
+        for idx in part:
+            parts.setdefault(space.score(codes[idx], g, g_set), []).append(idx)
+        return parts
+
+    total = 0
+    depth = 0
+    stack: List[Tuple[List[int], int]] = [(list(range(len(codes))), 1)]
+    first = True
+    while stack:
+        part, level = stack.pop()
+        if len(part) == 1:
+            total += level
+            depth = max(depth, level)
+            continue
+        if first:
+            best_parts = split(part, 0)
+            first = False
+        else:
+            pool = part if len(part) <= GREEDY_POOL else rng.sample(part, GREEDY_POOL)
+            best_parts = {}
+            best_score = math.inf
+            for guess in pool:
+                parts = split(part, guess)
+                score = sum(len(p) ** 2 for p in parts.values())
+                if score < best_score:
+                    best_score, best_parts = score, parts
+        for fb, p in best_parts.items():
+            if fb == space.solved:
+                total += level
+                depth = max(depth, level)
+            else:
+                stack.append((p, level + 1))
+    return total, depth
+
+
+# -----------------------
+# Tablo
+# -----------------------
+def _read_json(path: str) -> Dict[str, object]:
+    try:
+        with open(path, "r", encoding="utf-8") as fh:
+            return json.load(fh)
+    except (OSError, ValueError):
+        return {}
+
+
+def _write_json(path: str, data: Dict[str, object]) -> None:
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as fh:
+        json.dump(data, fh, indent=2, sort_keys=True)
+    os.replace(tmp, path)
+
+
+def compute_table(
+    configs: Iterable[Tuple[int, int]],
+    *,
+    processes: int = 1,
+    checkpoint: Optional[str] = None,
+    exact_configs: Iterable[Tuple[int, int]] = EXACT_CONFIGS,
+) -> Dict[str, Dict[str, object]]:
+    configs = list(configs)
+    done = _read_json(checkpoint) if checkpoint else {}
+    table: Dict[str, Dict[str, object]] = {}
+
+    wanted = set(exact_configs)
+    exact = [config for config in configs if config in wanted]
+    jobs = []
+    for color_count, length in exact:
+        for fb in _root_feedbacks(color_count, length):
+            if f"{config_key(color_count, length)}:{fb}" not in done:
+                jobs.append((color_count, length, fb))
+
+    def record(result: Tuple[str, int, int, int]) -> None:
+        key, fb, total, depth = result
+        done[f"{key}:{fb}"] = [total, depth]
+        if checkpoint:
+            _write_json(checkpoint, done)
+
+    # Büyük alt ağaçlar önce başlatılır ki süreçler sona doğru boş kalmasın.
+    jobs.sort(key=lambda job: -_root_part_size(*job))
+    if processes > 1 and len(jobs) > 1:
+        with multiprocessing.Pool(processes) as pool:
+            for result in pool.imap_unordered(_search_job, jobs):
+                record(result)
+    else:
+        for job in jobs:
+            record(_search_job(job))
+
+    for color_count, length in exact:
+        key = config_key(color_count, length)
+        count = math.perm(color_count, length)
+        results = [done[f"{key}:{fb}"] for fb in _root_feedbacks(color_count, length)]
+        total = count + sum(r[0] for r in results)  # type: ignore[index]
+        depth = 1 + max(r[1] for r in results)  # type: ignore[index]
+        table[key] = _entry(color_count, length, total, depth, exact=True)
+
+    for color_count, length in configs:
+        if (color_count, length) in exact:
+            continue
+        total, depth = greedy_values(color_count, length)
+        table[config_key(color_count, length)] = _entry(
+            color_count, length, total, depth, exact=False
+        )
+    return table
+
+
+@lru_cache(maxsize=None)
+def _root_sizes(color_count: int, length: int) -> Dict[int, int]:
+    space = Space(color_count, length, build_table=False)
+    first = space.codes[0]
+    first_set = set(first)
+    sizes: Dict[int, int] = {}
+    for code in space.codes:
+        fb = space.score(code, first, first_set)
+        if fb != space.solved:
+            sizes[fb] = sizes.get(fb, 0) + 1
+    return sizes
+
+
+def _root_feedbacks(color_count: int, length: int) -> List[int]:
+    return sorted(_root_sizes(color_count, length))
+
+
+def _root_part_size(color_count: int, length: int, fb: int) -> int:
+    return _root_sizes(color_count, length)[fb]
+
+
+def _entry(color_count: int, length: int, total: int, depth: int, exact: bool) -> Dict[str, object]:
+    count = math.perm(color_count, length)
+    return {
+        "color_count": color_count,
+        "length": length,
+        "codes": count,
+        "worst_case": depth,
+        "average": round(total / count, 4),
+        "exact": exact,
+        "method": "branch_and_bound" if exact else f"greedy_pool_{GREEDY_POOL}",
+    }
+
+
+def load_table(path: str = TABLE_PATH) -> Dict[str, Dict[str, object]]:
+    return _read_json(path)  # type: ignore[return-value]
+
+
+def recommended_attempts(
+    table: Dict[str, Dict[str, object]], color_count: int, length: int
+) -> Optional[Dict[str, object]]:
+    """Önerilen deneme hakkı; bilinmiyorsa ``None``.
+
+    ``exact`` doğruysa ``worst_case`` en iyi oyunun en kötü durumudur; yanlışsa
+    bilinen bir stratejinin garanti ettiği, en iyi oyun için bir üst sınırdır.
+    """
+    entry = table.get(config_key(color_count, length))
+    if not entry:
+        return None
+    return {
+        "worst_case": int(entry["worst_case"]),  # type: ignore[arg-type]
+        "exact": bool(entry.get("exact")),
+    }
+
+
+def supported_configs() -> List[Tuple[int, int]]:
+    return [
+        (color_count, length)
+        for color_count in sorted(PALETTES)
+        for length in SUPPORTED_LENGTHS
+        if length <= color_count
+    ]
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="En iyi strateji tablosunu hesaplar.")
+    parser.add_argument("--processes", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--output", default=TABLE_PATH, help="Tablo dosyası")
+    parser.add_argument(
+        "--checkpoint",
+        default=TABLE_PATH + ".partial",
+        help="Biten alt ağaçların yazıldığı ara kayıt dosyası",
+    )
+    parser.add_argument(
+        "--exact",
+        action="append",
+        default=[],
+        help="Bu yapılandırma için de tam arama yap (ör. 6x6); birden çok kez verilebilir",
+    )
+    parser.add_argument(
+        "--config",
+        action="append",
+        help="Yalnızca bu yapılandırmayı hesapla (ör. 6x4); birden çok kez verilebilir",
+    )
+    args = parser.parse_args(argv)
+    configs = supported_configs()
+    if args.config:
+        wanted = set(args.config)
+        configs = [c for c in configs if config_key(*c) in wanted]
+    extra = set(args.exact)
+    exact_configs = EXACT_CONFIGS | {c for c in supported_configs() if config_key(*c) in extra}
+    table = load_table(args.output)
+    table.update(
+        compute_table(
+            configs,
+            processes=args.processes,
+            checkpoint=args.checkpoint,
+            exact_configs=exact_configs,
+        )
+    )
+    _write_json(args.output, table)
+    for key in sorted(table):
+        entry = table[key]
+        kind = "tam" if entry["exact"] else "üst sınır"
+        print(
+            f"{key}: en kötü {entry['worst_case']}, ortalama {entry['average']} ({kind})"
+        )
+
+
+if __name__ == "__main__":
+    main()
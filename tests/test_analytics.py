@@ -0,0 +1,118 @@
+import itertools
+
+from game import feedback
+from analytics import aggregate_file, iter_games, merge_totals
+from replay_log import EventLogWriter, GameEvent
+from web_game import create_game
+
+SYMBOLS = list("RGBYOP")
+
+
+def _wrong_guesses(game, count):
+    codes = (code for code in itertools.permutations(SYMBOLS, game.length) if code != game.secret)
+    return [list(code) for code in itertools.islice(codes, count)]
+
+
+def _play(writer, game, guesses):
+    for guess in guesses:
+        game.make_guess(guess)
+        writer.log_guess(game, game.history[-1])
+    if game.status != "ongoing":
+        writer.log_end(game)
+
+
+def _log(path, build):
+    writer = EventLogWriter(path)
+    build(writer)
+    writer.close(timeout=5)
+    return str(path)
+
+
+def _pvp_game(writer, seed=1):
+    game = create_game(
+        mode="pvp_one_by_one", length=3, symbols=SYMBOLS, max_attempts=5,
+        players=["A", "B"], seed=seed,
+    )
+    writer.log_start(game)
+    # A, B, A, B, ardından A kazanır: A'nın 3 tahmini, B'nin 2 tahmini.
+    _play(writer, game, _wrong_guesses(game, 4) + [list(game.secret)])
+    return game
+
+
+def test_pvp_counts_only_the_winners_guesses(tmp_path):
+    path = _log(tmp_path / "pvp.log", _pvp_game)
+    stats = aggregate_file(path, compare_solver=True)[(6, 3, "pvp_one_by_one")]
+
+    assert (stats.games, stats.wins) == (1, 1)
+    assert stats.guesses_to_win == 3
+    assert stats.human_guesses == 3
+    assert stats.moves_timed == 5
+
+
+def test_rejected_and_abandoned_games_are_not_results(tmp_path):
+    def build(writer):
+        offline = create_game(
+            mode="player_vs_ai", length=3, symbols=SYMBOLS, max_attempts=6, seed=2, offline=True
+        )
+        writer.log_start(offline)
+        wrong = _wrong_guesses(offline, 1)
+        offline.verify_history(wrong + [list(offline.secret)], [[9, 9], [3, 0]])
+        for entry in offline.history:
+            writer.log_guess(offline, entry)
+        writer.log_end(offline)
+
+        abandoned = create_game(mode="player_vs_ai", length=3, symbols=SYMBOLS, max_attempts=6, seed=3)
+        writer.log_start(abandoned)
+        _play(writer, abandoned, _wrong_guesses(abandoned, 1))
+        writer.log_end(abandoned, status="abandoned")
+
+    totals = aggregate_file(_log(tmp_path / "mixed.log", build))
+    offline = totals[(6, 3, "player_vs_ai_offline")]
+    online = totals[(6, 3, "player_vs_ai")]
+
+    assert (offline.games, offline.rejected, offline.finished, offline.wins) == (1, 1, 0, 0)
+    assert (online.games, online.abandoned, online.finished) == (1, 1, 0)
+    assert online.moves_timed == 1
+
+
+def test_offline_games_have_no_move_times(tmp_path):
+    def build(writer):
+        game = create_game(
+            mode="player_vs_ai", length=3, symbols=SYMBOLS, max_attempts=6, seed=4, offline=True
+        )
+        writer.log_start(game)
+        wrong = _wrong_guesses(game, 2)
+        claimed = [list(feedback(game.secret, guess)) for guess in wrong] + [[3, 0]]
+        game.verify_history(wrong + [list(game.secret)], claimed)
+        for entry in game.history:
+            writer.log_guess(game, entry)
+        writer.log_end(game)
+
+    stats = aggregate_file(_log(tmp_path / "offline.log", build))[(6, 3, "player_vs_ai_offline")]
+    assert (stats.wins, stats.guesses_to_win) == (1, 3)
+    assert stats.moves_timed == 0
+    assert stats.summary()["avg_move_seconds"] is None
+
+
+def test_stale_games_are_swept():
+    def start(gid, ts):
+        data = {"mode": "player_vs_ai", "palette": "RGBYOP", "length": 3, "max_attempts": 6}
+        return GameEvent("start", gid, ts, data)
+
+    def end(gid, ts):
+        return GameEvent("end", gid, ts, {"status": "won", "winner": "A", "secret": ("R", "G", "B")})
+
+    guess_b = GameEvent("guess", "b" * 32, 150.0, {"player": "A", "guess": ("R", "G", "Y")})
+    events = [start("a" * 32, 0.0), start("b" * 32, 50.0), guess_b, end("a" * 32, 200.0), end("b" * 32, 210.0)]
+    finished = [game.game_id for game in iter_games(events, stale_after=100.0)]
+
+    # "a" 150. saniyedeki taramada 100 sn'den uzun sessiz kaldığı için atılır.
+    assert finished == ["b" * 32]
+
+
+def test_merge_totals_across_files(tmp_path):
+    first = aggregate_file(_log(tmp_path / "one.log", _pvp_game))
+    second = aggregate_file(_log(tmp_path / "two.log", lambda writer: _pvp_game(writer, seed=5)))
+    merged = merge_totals([first, second])[(6, 3, "pvp_one_by_one")]
+
+    assert (merged.games, merged.wins, merged.guesses_to_win) == (2, 2, 6)
@@ -0,0 +1,113 @@
+import random
+
+import pytest
+
+from game import PALETTES, CandidateSet, _code_space, feedback
+from web_game import AI_NAME, RaceVsAIGame
+
+
+def _naive(codes, guess, fb):
+    return tuple(code for code in codes if feedback(code, guess) == fb)
+
+
+@pytest.mark.parametrize("color_count,length", [(6, 3), (6, 4), (6, 6), (8, 4), (8, 6)])
+def test_candidate_set_matches_naive_filtering(color_count, length):
+    symbols = PALETTES[color_count]
+    rng = random.Random(color_count * 10 + length)
+    for _ in range(5):
+        secret = tuple(rng.sample(symbols, length))
+        candidates = CandidateSet(length, symbols)
+        expected = _code_space(tuple(symbols), length)
+        while len(candidates) > 1:
+            guess = rng.choice(candidates.codes)
+            fb = feedback(secret, guess)
+            candidates.apply(guess, fb)
+            expected = _naive(expected, guess, fb)
+            # Sıra da aynı olmalı: tohumlu oyunlar adayı sıraya göre seçer.
+            assert candidates.codes == expected
+        assert candidates.codes == (secret,)
+
+
+def test_first_filter_shares_code_space_tuples():
+    symbols = PALETTES[8]
+    candidates = CandidateSet(6, symbols)
+    guess = ("W", "C", "P", "O", "Y", "B")
+    candidates.apply(guess, (1, 4))
+    shared = {id(code) for code in _code_space(tuple(symbols), 6)}
+    assert candidates.codes
+    assert all(id(code) in shared for code in candidates.codes)
+
+
+def test_guess_with_repeated_colours_is_filtered_naively():
+    symbols = PALETTES[6]
+    candidates = CandidateSet(4, symbols)
+    guess = ("R", "R", "G", "B")
+    candidates.apply(guess, (1, 1))
+    assert candidates.codes == _naive(_code_space(tuple(symbols), 4), guess, (1, 1))
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _race(seed=11, **kwargs):
+    clock = FakeClock()
+    game = RaceVsAIGame(4, PALETTES[6], 10, "Ada", seed=seed, clock=clock, **kwargs)
+    return game, clock
+
+
+def _wrong_guess(game):
+    return next(code for code in _code_space(tuple(PALETTES[6]), 4) if code != game.secret)
+
+
+def test_ai_moves_only_when_its_interval_elapses():
+    game, clock = _race(ai_interval=5.0)
+    clock.now = 4.9
+    game.tick()
+    assert game.ai_history == []
+    clock.now = 10.0
+    game.tick()
+    assert len(game.ai_history) == 2 or game.winner == AI_NAME
+
+
+def test_ai_win_during_make_guess_returns_finished_state():
+    game, clock = _race(ai_interval=1.0)
+    game.ai_strength = 1.0
+    clock.now = 1000.0
+    game.make_guess(_wrong_guess(game))
+
+    assert game.status == "lost"
+    assert game.winner == AI_NAME
+    assert game.history == []
+    assert game.to_dict()["race"]["ai_history"]
+
+
+def test_adapt_stays_within_bounds():
+    game, _ = _race()
+    for _ in range(20):
+        game.candidates.codes = game.candidates.codes[:1]
+        game._adapt()
+    assert game.ai_strength == 1.0
+    assert game.ai_interval == RaceVsAIGame.MIN_INTERVAL
+
+    game, _ = _race()
+    for _ in range(20):
+        game.solver.remaining.codes = game.solver.remaining.codes[:1]
+        game._adapt()
+    assert game.ai_strength == RaceVsAIGame.MIN_STRENGTH
+    assert game.ai_interval == RaceVsAIGame.MAX_INTERVAL
+
+
+def test_player_guess_narrows_candidates_and_keeps_race_going():
+    game, _ = _race()
+    guess = _wrong_guess(game)
+    game.make_guess(guess)
+    assert game.status == "ongoing"
+    assert len(game.history) == 1
+    assert game.candidates.codes == _naive(
+        _code_space(tuple(PALETTES[6]), 4), guess, feedback(game.secret, guess)
+    )
@@ -0,0 +1,75 @@
+import itertools
+import random
+
+import pytest
+
+from game import (
+    PALETTES,
+    CodeError,
+    code_count,
+    derive_seed,
+    generate_secret,
+    parse_guess,
+    unrank_code,
+    validator_for,
+)
+from web_game import create_game
+
+VALIDATOR = validator_for(PALETTES[6])
+
+
+def _reason(items, length=4):
+    with pytest.raises(CodeError) as info:
+        VALIDATOR.validate(items, length)
+    return info.value.reason
+
+
+def test_valid_codes_are_normalised():
+    assert VALIDATOR.validate("rgby", 4) == ("R", "G", "B", "Y")
+    assert VALIDATOR.validate(["r", "G", "b", "Y"], 4) == ("R", "G", "B", "Y")
+    assert VALIDATOR.validate(iter("OPR"), 3) == ("O", "P", "R")
+
+
+def test_each_reason():
+    assert _reason("RGB") == "length"
+    assert _reason("RGBZ") == "symbol"
+    assert _reason("RGBR") == "duplicate"
+
+
+def test_symbol_errors_win_over_duplicates():
+    assert _reason(["R", "R", "Z", "G"]) == "symbol"
+    assert _reason("RRGZ") == "symbol"
+
+
+def test_non_str_and_multi_character_items():
+    assert _reason([1, "G", "B", "Y"]) == "symbol"
+    assert _reason([None, "G", "B", "Y"]) == "symbol"
+    assert _reason(["RG", "B", "Y", "O"]) == "symbol"
+    assert _reason(["", "B", "Y", "O"]) == "symbol"
+    assert _reason(["ğ", "B", "Y", "O"]) == "symbol"
+
+
+def test_parse_guess_messages_keep_the_old_order():
+    assert parse_guess(" r g b y ", 4, PALETTES[6]) == ["R", "G", "B", "Y"]
+    with pytest.raises(ValueError, match="uzunluğu"):
+        parse_guess("RG", 4, PALETTES[6])
+    with pytest.raises(ValueError, match="Geçersiz harf"):
+        parse_guess("RRZG", 4, PALETTES[6])
+    with pytest.raises(ValueError, match="en fazla bir kez"):
+        parse_guess("RRGB", 4, PALETTES[6])
+
+
+@pytest.mark.parametrize("color_count,length", [(6, 1), (6, 3), (6, 6), (8, 4)])
+def test_unrank_code_follows_permutations_order(color_count, length):
+    symbols = PALETTES[color_count]
+    codes = list(itertools.permutations(symbols, length))
+    assert code_count(length, color_count) == len(codes)
+    assert [unrank_code(i, length, symbols) for i in range(len(codes))] == codes
+
+
+def test_fixed_seed_gives_a_stable_secret():
+    assert generate_secret(4, PALETTES[6], random.Random(123)) == ("R", "Y", "G", "P")
+    rng = random.Random(derive_seed(7, "game", 1))
+    assert generate_secret(6, PALETTES[8], rng) == ("B", "O", "Y", "C", "G", "R")
+    game = create_game(mode="player_vs_ai", length=5, symbols=PALETTES[8], max_attempts=10, seed=2024)
+    assert game.secret == ("O", "P", "R", "Y", "C")
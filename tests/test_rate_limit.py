@@ -0,0 +1,65 @@
+import sqlite3
+
+import pytest
+
+import app as app_module
+from rate_limit import DEFAULT_RULES, MemoryBackend, RateLimiter, Rule, SQLiteBackend
+
+RULE = Rule(rate=1.0, capacity=2)
+
+
+def test_denied_request_does_not_charge_other_buckets():
+    backend = MemoryBackend()
+    assert backend.consume(["sid:a", "ip:x"], RULE, 0.0) == 0.0
+    assert backend.consume(["sid:a", "ip:x"], RULE, 0.0) == 0.0
+    # "sid:a" tükendi; reddedilen istek "ip:y" kovasından jeton harcamaz.
+    assert backend.consume(["sid:a", "ip:y"], RULE, 0.0) == pytest.approx(1.0)
+    assert backend.consume(["sid:b", "ip:y"], RULE, 0.0) == 0.0
+    assert backend.consume(["sid:c", "ip:y"], RULE, 0.0) == 0.0
+
+
+def test_memory_backend_evicts_least_recently_used():
+    backend = MemoryBackend(max_keys=3)
+    backend.consume(["ip:busy"], RULE, 0.0)
+    backend.consume(["ip:busy"], RULE, 0.0)
+    for idx in range(10):
+        backend.consume([f"ip:new{idx}"], RULE, 0.0)
+        # Sınırlanan istemci her istekte kovasını günceller ve atılmaz.
+        assert backend.consume(["ip:busy"], RULE, 0.0) > 0
+    assert len(backend._buckets) == 3
+
+
+def test_sqlite_backend_refills_and_purges(tmp_path):
+    path = str(tmp_path / "limits.db")
+    backend = SQLiteBackend(path, purge_interval=10.0)
+    assert backend.consume(["k1"], RULE, 100.0) == 0.0
+    assert backend.consume(["k1"], RULE, 100.0) == 0.0
+    assert backend.consume(["k1"], RULE, 100.0) == pytest.approx(1.0)
+    assert backend.consume(["k1"], RULE, 101.0) == 0.0
+    backend.consume(["k2"], RULE, 101.0)
+
+    # Son dokunuştan bu yana capacity / rate = 2 sn geçti; iki kova da dolu sayılır.
+    backend.consume(["k3"], RULE, 115.0)
+    keys = [row[0] for row in sqlite3.connect(path).execute("SELECT key FROM buckets")]
+    assert keys == ["k3"]
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(app_module, "_limiter", RateLimiter(DEFAULT_RULES))
+    return app_module.app.test_client()
+
+
+def test_start_game_returns_429_with_retry_after(client):
+    payload = {"mode": "player_vs_ai", "length": 4, "color_count": 6, "max_attempts": 8}
+    capacity = int(DEFAULT_RULES["start_game"].capacity)
+    for _ in range(capacity):
+        assert client.post("/start", json=payload).status_code == 200
+
+    response = client.post("/start", json=payload)
+    assert response.status_code == 429
+    assert int(response.headers["Retry-After"]) >= 1
+    assert "error" in response.get_json()
+
+    counters = client.get("/metrics").get_json()["rate_limit"]
+    assert counters["start_game"] == {"allowed": capacity, "limited": 1}
@@ -0,0 +1,64 @@
+import os
+
+from replay_log import EventLogWriter, read_events
+from web_game import HistoryEntry, PlayerVsAIGame
+
+
+def _write_game(path):
+    game = PlayerVsAIGame(4, list("RGBYOP"), 10, "Ada", seed=42)
+    writer = EventLogWriter(path, batch_size=2)
+    writer.log_start(game)
+    for guess in (("R", "G", "B", "Y"), tuple(game.secret)):
+        game.make_guess(guess)
+        writer.log_guess(game, game.history[-1])
+    writer.log_end(game)
+    writer.close(timeout=5)
+    return game, writer
+
+
+def test_round_trip(tmp_path):
+    path = str(tmp_path / "events.log")
+    game, writer = _write_game(path)
+    events = list(read_events(path))
+
+    assert writer.dropped == 0
+    assert [e.kind for e in events] == ["start", "guess", "feedback", "guess", "feedback", "end"]
+    assert {e.game_id for e in events} == {game.game_id}
+    start = events[0].data
+    assert start["mode"] == "player_vs_ai"
+    assert start["palette"] == "RGBYOP"
+    assert (start["length"], start["max_attempts"], start["seed"]) == (4, 10, 42)
+    assert start["players"] == ["Ada"]
+    first = game.history[0]
+    assert events[1].data == {"player": "Ada", "guess": first.guess}
+    assert events[2].data == {"exact": first.exact, "color_only": first.color_only}
+    assert events[-1].data == {
+        "status": "won",
+        "winner": "Ada",
+        "secret": game.secret,
+        "guesses": 2,
+    }
+
+
+def test_truncated_tail_is_skipped(tmp_path):
+    path = str(tmp_path / "events.log")
+    _write_game(path)
+    size = os.path.getsize(path)
+    with open(path, "r+b") as fh:
+        fh.truncate(size - 3)
+
+    events = list(read_events(path))
+    assert [e.kind for e in events] == ["start", "guess", "feedback", "guess", "feedback"]
+
+
+def test_unwritable_path_keeps_draining(tmp_path):
+    path = str(tmp_path / "missing" / "events.log")
+    game = PlayerVsAIGame(3, list("RGBYOP"), 5, seed=1)
+    writer = EventLogWriter(path)
+    writer.log_start(game)
+    writer.log_guess(game, HistoryEntry("Oyuncu", ("R", "G", "B"), 0, 0))
+    writer.close(timeout=5)
+
+    assert not writer._thread.is_alive()
+    assert writer.written == 0
+    assert writer.dropped == 3
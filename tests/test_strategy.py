@@ -0,0 +1,75 @@
+import itertools
+import math
+from functools import lru_cache
+
+import pytest
+
+import strategy
+from game import PALETTES, feedback
+
+
+def naive_values(symbols, length):
+    """Her düğümde her tahmini deneyen, budamasız en iyi toplam ve derinlik."""
+    codes = list(itertools.permutations(symbols, length))
+    solved = (length, 0)
+
+    @lru_cache(maxsize=None)
+    def options(part):
+        result = []
+        for guess in range(len(codes)):
+            parts = {}
+            for idx in part:
+                parts.setdefault(feedback(codes[idx], codes[guess]), set()).add(idx)
+            rest = [frozenset(p) for fb, p in parts.items() if fb != solved]
+            if guess in part or len(rest) > 1:
+                result.append(rest)
+        return result
+
+    @lru_cache(maxsize=None)
+    def total(part):
+        if len(part) == 1:
+            return 1
+        return len(part) + min(sum(total(p) for p in rest) for rest in options(part))
+
+    @lru_cache(maxsize=None)
+    def depth(part):
+        if len(part) == 1:
+            return 1
+        return min(1 + max((depth(p) for p in rest), default=0) for rest in options(part))
+
+    everything = frozenset(range(len(codes)))
+    return total(everything), depth(everything)
+
+
+@pytest.fixture
+def small_palettes(monkeypatch):
+    monkeypatch.setitem(PALETTES, 4, ["R", "G", "B", "Y"])
+    yield
+    strategy._space.cache_clear()
+    strategy._second_guesses.cache_clear()
+    strategy._root_sizes.cache_clear()
+
+
+@pytest.mark.parametrize("length", [2, 3, 4])
+def test_exact_search_matches_naive_search(small_palettes, length):
+    config = (4, length)
+    entry = strategy.compute_table([config], exact_configs={config})[strategy.config_key(*config)]
+    total, depth = naive_values(PALETTES[4], length)
+
+    assert entry["exact"] is True
+    assert entry["worst_case"] == depth
+    assert entry["average"] == round(total / math.perm(4, length), 4)
+
+
+def test_committed_exact_entry_is_reproduced():
+    table = strategy.load_table()
+    entry = strategy.compute_table([(6, 3)])["6x3"]
+    assert entry == table["6x3"]
+    assert (entry["average"], entry["worst_case"]) == (3.6333, 5)
+
+
+def test_recommended_attempts_reports_bounds():
+    table = strategy.load_table()
+    assert strategy.recommended_attempts(table, 6, 4) == {"worst_case": 5, "exact": True}
+    assert strategy.recommended_attempts(table, 8, 6)["exact"] is False
+    assert strategy.recommended_attempts({}, 6, 4) is None
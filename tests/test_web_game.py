@@ -0,0 +1,67 @@
+import pytest
+
+from game import feedback
+from web_game import GameError, OfflinePlayerVsAIGame, create_game, secret_commitment
+
+SYMBOLS = list("RGBYOP")
+
+
+def _offline_game(seed=3):
+    game = create_game(
+        mode="player_vs_ai", length=4, symbols=SYMBOLS, max_attempts=8, seed=seed, offline=True
+    )
+    assert isinstance(game, OfflinePlayerVsAIGame)
+    return game
+
+
+def _wrong_guess(game):
+    return next(g for g in (list("RGBY"), list("OPRG")) if tuple(g) != game.secret)
+
+
+def test_salt_is_withheld_until_finished():
+    game = _offline_game()
+    payload = game.offline_payload()
+    assert "salt" not in payload
+    assert "key" in payload and "masked" in payload
+
+    game.verify_history([list(game.secret)], [[4, 0]])
+    payload = game.offline_payload()
+    assert "key" not in payload
+    assert secret_commitment(game.secret, payload["salt"]) == payload["commitment"]
+
+
+def test_consistent_history_is_recorded_under_offline_mode():
+    game = _offline_game()
+    first = _wrong_guess(game)
+    claimed = [list(feedback(game.secret, first)), [4, 0]]
+
+    result = game.verify_history([first, list(game.secret)], claimed)
+
+    assert result["consistent"] is True
+    assert result["mismatches"] == []
+    assert game.status == "won"
+    assert game.mode_key == "player_vs_ai_offline"
+    assert [entry.guess for entry in game.history] == [tuple(first), game.secret]
+
+
+def test_mismatched_feedback_rejects_the_game():
+    game = _offline_game()
+    first = _wrong_guess(game)
+    exact, color_only = feedback(game.secret, first)
+
+    result = game.verify_history([first, list(game.secret)], [[exact, color_only + 1], [4, 0]])
+
+    assert result["consistent"] is False
+    assert result["mismatches"] == [1]
+    assert result["suspicious"] is True
+    assert game.status == "rejected"
+    assert game.winner is None
+
+
+def test_incomplete_or_repeated_submissions_are_refused():
+    game = _offline_game()
+    with pytest.raises(GameError):
+        game.verify_history([_wrong_guess(game)], [[0, 0]])
+    game.verify_history([list(game.secret)], [[4, 0]])
+    with pytest.raises(GameError):
+        game.verify_history([list(game.secret)], [[4, 0]])
@@ -1,10 +1,27 @@
 """Web arayüzü için Mastermind oyun motoru."""
 from __future__ import annotations
 
+import hashlib
+import random
+import secrets
+import time
+import uuid
 from dataclasses import dataclass
-from typing import Dict, Iterable, List, Optional, Sequence, Tuple
-
-from game import COLOR_NAMES, PALETTES, feedback, generate_secret, pretty
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from game import (
+    COLOR_NAMES,
+    PALETTES,
+    CandidateSet,
+    CodeError,
+    Solver,
+    derive_seed,
+    feedback,
+    generate_secret,
+    new_seed,
+    pretty,
+    validator_for,
+)
 
 
 class GameError(Exception):
@@ -52,7 +69,13 @@ class BaseGame:
     mode_key: str = "base"
     mode_label: str = "Mastermind"
 
-    def __init__(self, length: int, symbols: Sequence[str], max_attempts: int) -> None:
+    def __init__(
+        self,
+        length: int,
+        symbols: Sequence[str],
+        max_attempts: int,
+        seed: Optional[int] = None,
+    ) -> None:
         if length < 1:
             raise GameError("Kod uzunluğu en az 1 olmalı.")
         if len(set(symbols)) < length:
@@ -60,6 +83,11 @@ class BaseGame:
         self.length = length
         self.symbols = list(symbols)
         self.max_attempts = max_attempts
+        self.game_id: str = uuid.uuid4().hex
+        # Aynı tohum aynı gizli kodu üretir (zamanlı modlar dışında hamleler de tekrarlanır).
+        self.seed: int = new_seed() if seed is None else seed
+        self.rng = random.Random(self.seed)
+        self._validator = validator_for(self.symbols)
         self.history: List[HistoryEntry] = []
         self.status: str = "ongoing"
         self.message: str = ""
@@ -69,15 +97,15 @@ class BaseGame:
     # Genel yardımcılar
     # -----------------------
     def _validate_guess(self, guess: Iterable[str]) -> Tuple[str, ...]:
-        guess_list = [str(item).upper() for item in guess]
-        if len(guess_list) != self.length:
-            raise GameError(f"Tahmin {self.length} renk içermeli.")
-        if any(code not in self.symbols for code in guess_list):
-            allowed = ", ".join(self.symbols)
-            raise GameError(f"Sadece şu harfleri kullanabilirsin: {allowed}.")
-        if len(set(guess_list)) != len(guess_list):
-            raise GameError("Her renk yalnızca bir kez seçilebilir.")
-        return tuple(guess_list)
+        try:
+            return self._validator.validate(guess, self.length)
+        except CodeError as exc:
+            if exc.reason == "length":
+                raise GameError(f"Tahmin {self.length} renk içermeli.") from None
+            if exc.reason == "symbol":
+                allowed = ", ".join(self.symbols)
+                raise GameError(f"Sadece şu harfleri kullanabilirsin: {allowed}.") from None
+            raise GameError("Her renk yalnızca bir kez seçilebilir.") from None
 
     def _history_dict(self) -> List[Dict[str, object]]:
         return [entry.to_dict(i + 1) for i, entry in enumerate(self.history)]
@@ -97,6 +125,9 @@ class BaseGame:
     def secret_payload(self) -> Optional[Dict[str, object]]:
         return None
 
+    def tick(self) -> None:
+        """Zamana bağlı durumu günceller; zamanlı modlar dışında bir şey yapmaz."""
+
     def to_dict(self) -> Dict[str, object]:
         payload: Dict[str, object] = {
             "mode": self.mode_key,
@@ -133,10 +164,11 @@ class PlayerVsAIGame(BaseGame):
         symbols: Sequence[str],
         max_attempts: int,
         player_name: Optional[str] = None,
+        seed: Optional[int] = None,
     ) -> None:
-        super().__init__(length, symbols, max_attempts)
+        super().__init__(length, symbols, max_attempts, seed)
         self.player_name = (player_name or "Oyuncu").strip() or "Oyuncu"
-        self.secret: Tuple[str, ...] = generate_secret(length, symbols)
+        self.secret: Tuple[str, ...] = generate_secret(length, symbols, self.rng)
         self.remaining_attempts = max_attempts
         self.message = (
             f"{self.player_name}, gizli kodu çözmek için {self.remaining_attempts} hakkın var."
@@ -193,6 +225,125 @@ class PlayerVsAIGame(BaseGame):
             )
 
 
+def secret_commitment(secret: Sequence[str], salt: str) -> str:
+    """Gizli kodu açıklamadan ona bağlanan SHA-256 taahhüdü."""
+    return hashlib.sha256(f"{salt}:{''.join(secret)}".encode("utf-8")).hexdigest()
+
+
+class OfflinePlayerVsAIGame(PlayerVsAIGame):
+    """Tahminlerin tarayıcıda puanlandığı, sonucun ``verify_history`` ile
+    tek seferde gönderildiği Oyuncu vs Yapay Zekâ oyunu.
+
+    Tarayıcı puanlama yapabilmek için gizli kodu alır; maske yalnızca koda
+    göz ucuyla bakmayı engeller, gizlilik sağlamaz. Bu yüzden çevrimdışı
+    sonuçlar doğrulanamaz: sunucu yalnızca gönderilen geri bildirimlerin
+    kendi gizli koduyla tutarlı olduğunu denetler. Tutmayan geçmişler
+    ``rejected`` durumuyla biter; tutarlı olanlar da ayrı bir mod altında
+    kaydedilir ve normal sonuçlarla karıştırılmaz.
+
+    Taahhüt (salt + SHA-256) oyun başında, salt ise oyun bitince gönderilir;
+    oyuncu sunucunun gizli kodu oyun sırasında değiştirmediğini böyle denetler.
+    """
+
+    mode_key = "player_vs_ai_offline"
+    mode_label = "Oyuncu vs Yapay Zekâ (Çevrimdışı)"
+
+    # Bu olasılıktan daha düşük bir şansla kazanılan oyunlar işaretlenir. Gizli kodu
+    # bilen bir istemci birkaç sıradan tahminle bu denetimi aşabilir; yalnızca ipucudur.
+    SUSPICIOUS_WIN_CHANCE = 0.02
+
+    def __init__(
+        self,
+        length: int,
+        symbols: Sequence[str],
+        max_attempts: int,
+        player_name: Optional[str] = None,
+        seed: Optional[int] = None,
+    ) -> None:
+        super().__init__(length, symbols, max_attempts, player_name, seed)
+        self.salt = secrets.token_hex(16)
+        self.commitment = secret_commitment(self.secret, self.salt)
+        self._mask = secrets.token_bytes(length)
+        self.verification: Optional[Dict[str, object]] = None
+
+    def offline_payload(self) -> Dict[str, object]:
+        payload: Dict[str, object] = {
+            "game_id": self.game_id,
+            "commitment": self.commitment,
+        }
+        if self.status == "ongoing":
+            indices = bytes(self.symbols.index(code) for code in self.secret)
+            payload["key"] = self._mask.hex()
+            payload["masked"] = bytes(i ^ k for i, k in zip(indices, self._mask)).hex()
+        else:
+            # Salt erken gönderilirse taahhüt küçük kod uzayında kaba kuvvetle çözülür.
+            payload["salt"] = self.salt
+        if self.verification is not None:
+            payload["verification"] = self.verification
+        return payload
+
+    def to_dict(self) -> Dict[str, object]:
+        payload = super().to_dict()
+        payload["offline"] = self.offline_payload()
+        return payload
+
+    def verify_history(
+        self,
+        guesses: Sequence[Sequence[str]],
+        claimed: Sequence[Sequence[int]],
+    ) -> Dict[str, object]:
+        """Tarayıcıda oynanan tüm oyunu sunucu tarafında yeniden oynatır.
+
+        Geri bildirimlerden biri tutmazsa oyun kazanılmış sayılmaz, ``rejected``
+        durumuyla biter.
+        """
+        if self.status != "ongoing" or self.history:
+            raise GameError("Bu oyunun sonucu zaten gönderildi.")
+        if not guesses or len(guesses) != len(claimed):
+            raise GameError("Tahmin geçmişi eksik veya hatalı.")
+        if len(guesses) > self.max_attempts:
+            raise GameError("Deneme hakkından fazla tahmin gönderildi.")
+        checked = []
+        for idx, (guess, fb) in enumerate(zip(guesses, claimed), 1):
+            guess_tuple = self._validate_guess(guess)
+            try:
+                claimed_fb = (int(fb[0]), int(fb[1]))
+            except (TypeError, ValueError, IndexError):
+                raise GameError("Geri bildirim verisi hatalı.") from None
+            solved = guess_tuple == self.secret
+            if solved and idx != len(guesses):
+                raise GameError("Oyun bittikten sonra tahmin gönderilmiş.")
+            checked.append((guess_tuple, claimed_fb))
+        if not solved and len(guesses) < self.max_attempts:
+            raise GameError("Oyun bitmeden sonuç gönderilemez.")
+
+        candidates = CandidateSet(self.length, self.symbols)
+        mismatches: List[int] = []
+        win_chance: Optional[float] = None
+        for idx, (guess_tuple, claimed_fb) in enumerate(checked, 1):
+            if guess_tuple == self.secret:
+                win_chance = 1 / max(1, len(candidates))
+            self.make_guess(guess_tuple)
+            entry = self.history[-1]
+            actual = (entry.exact, entry.color_only)
+            if actual != claimed_fb:
+                mismatches.append(idx)
+            candidates.apply(guess_tuple, actual)
+
+        self.verification = {
+            "consistent": not mismatches,
+            "mismatches": mismatches,
+            "win_chance": win_chance,
+            "suspicious": bool(mismatches)
+            or (win_chance is not None and win_chance < self.SUSPICIOUS_WIN_CHANCE),
+        }
+        if mismatches:
+            self.status = "rejected"
+            self.winner = None
+            self.message = "Gönderilen geri bildirimler sunucuyla uyuşmuyor; sonuç geçersiz."
+        return self.verification
+
+
 class PvPOneByOneGame(BaseGame):
     mode_key = "pvp_one_by_one"
     mode_label = "Oyuncu vs Oyuncu (Sırayla)"
@@ -203,14 +354,15 @@ class PvPOneByOneGame(BaseGame):
         symbols: Sequence[str],
         max_attempts: int,
         players: Sequence[str],
+        seed: Optional[int] = None,
     ) -> None:
         if len(players) < 2:
             raise GameError("İki oyuncu adı girmelisin.")
-        super().__init__(length, symbols, max_attempts)
+        super().__init__(length, symbols, max_attempts, seed)
         self.players = [
             (name.strip() or f"{idx + 1}. Oyuncu") for idx, name in enumerate(players[:2])
         ]
-        self.secret: Tuple[str, ...] = generate_secret(length, symbols)
+        self.secret: Tuple[str, ...] = generate_secret(length, symbols, self.rng)
         self.turn_index = 0
         self.guess_counts: Dict[str, int] = {name: 0 for name in self.players}
         self.message = f"Oyun başladı! İlk tahmin {self.players[0]} tarafından yapılacak."
@@ -286,9 +438,178 @@ class PvPOneByOneGame(BaseGame):
         )
 
 
+AI_NAME = "Yapay zekâ"
+
+
+class RaceVsAIGame(BaseGame):
+    """Oyuncu ile yapay zekâ aynı gizli kodu aynı anda çözmeye çalışır.
+
+    Yapay zekâ ``ai_interval`` saniyede bir tahmin yapar. Oyuncu yapay zekâdan
+    daha hızlı daralttıkça yapay zekâ güçlenir ve hızlanır, geride kaldıkça
+    zayıflar ve yavaşlar.
+
+    Yapay zekâ ``derive_seed(seed, "ai")`` ile kendi rastgele akışını kullanır;
+    böylece gizli kod tohumdan yeniden üretilebilir. Yapay zekânın hamleleri
+    ise duvar saatine bağlı olduğundan tohumla tekrarlanmaz.
+    """
+
+    mode_key = "race_vs_ai"
+    mode_label = "Yarış: Oyuncu vs Yapay Zekâ"
+
+    MIN_STRENGTH = 0.2
+    MIN_INTERVAL = 3.0
+    MAX_INTERVAL = 20.0
+
+    def __init__(
+        self,
+        length: int,
+        symbols: Sequence[str],
+        max_attempts: int,
+        player_name: Optional[str] = None,
+        seed: Optional[int] = None,
+        *,
+        ai_interval: float = 8.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        super().__init__(length, symbols, max_attempts, seed)
+        self.player_name = (player_name or "Oyuncu").strip() or "Oyuncu"
+        self.secret: Tuple[str, ...] = generate_secret(length, symbols, self.rng)
+        self.remaining_attempts = max_attempts
+        self.candidates = CandidateSet(length, self.symbols)
+        self.ai_rng = random.Random(derive_seed(self.seed, "ai"))
+        self.solver = Solver(length, self.symbols, self.ai_rng)
+        self.ai_history: List[HistoryEntry] = []
+        self.ai_strength = 0.6
+        self.ai_interval = ai_interval
+        self._clock = clock
+        self._next_ai_move = clock() + ai_interval
+        self.message = (
+            f"Yarış başladı! {self.player_name}, gizli kodu yapay zekâdan önce çöz."
+        )
+
+    def get_active_player(self) -> Optional[str]:
+        return self.player_name if self.status == "ongoing" else None
+
+    def get_attempts_left(self) -> Optional[int]:
+        return self.remaining_attempts
+
+    def players_summary(self) -> List[Dict[str, object]]:
+        return [
+            {
+                "name": self.player_name,
+                "remaining": self.remaining_attempts,
+                "total": self.max_attempts,
+                "is_active": self.status == "ongoing",
+            }
+        ]
+
+    def secret_payload(self) -> Optional[Dict[str, object]]:
+        if self.status == "ongoing":
+            return None
+        return {
+            "code": list(self.secret),
+            "text": _colors_text(self.secret),
+        }
+
+    def to_dict(self) -> Dict[str, object]:
+        payload = super().to_dict()
+        finished = self.status != "ongoing"
+        payload["race"] = {
+            "candidates_left": len(self.candidates),
+            "ai_guesses": len(self.ai_history),
+            "ai_candidates_left": len(self.solver.candidates),
+            "ai_strength": round(self.ai_strength, 2),
+            "next_ai_move_in": (
+                None if finished else max(0.0, self._next_ai_move - self._clock())
+            ),
+            # Yapay zekânın tahminleri oyun bitene kadar gizli kalır.
+            "ai_history": (
+                [entry.to_dict(i + 1) for i, entry in enumerate(self.ai_history)]
+                if finished
+                else []
+            ),
+        }
+        return payload
+
+    def tick(self) -> None:
+        now = self._clock()
+        while self.status == "ongoing" and now >= self._next_ai_move:
+            self._ai_move()
+            self._next_ai_move += self.ai_interval
+
+    def _ai_move(self) -> None:
+        if self.solver.candidates and self.ai_rng.random() < self.ai_strength:
+            guess = self.solver.next_guess()
+        else:
+            # Zayıf hamle: adaylara bakmadan rastgele bir kod.
+            guess = generate_secret(self.length, self.symbols, self.ai_rng)
+            self.solver.last_guess = guess
+        exact, color_only = feedback(self.secret, guess)
+        self.ai_history.append(HistoryEntry(AI_NAME, guess, exact, color_only))
+        if exact == self.length:
+            self.status = "lost"
+            self.winner = AI_NAME
+            self.message = (
+                f"Yapay zekâ gizli kodu {len(self.ai_history)}. tahminde senden önce buldu: "
+                + pretty(self.secret)
+                + f" ({_colors_text(self.secret)})"
+            )
+            return
+        self.solver.apply_feedback(guess, (exact, color_only))
+
+    def _adapt(self) -> None:
+        human_left = len(self.candidates)
+        ai_left = len(self.solver.candidates)
+        if human_left < ai_left:
+            self.ai_strength = min(1.0, self.ai_strength + 0.15)
+            self.ai_interval = max(self.MIN_INTERVAL, self.ai_interval * 0.85)
+        elif human_left > ai_left:
+            self.ai_strength = max(self.MIN_STRENGTH, self.ai_strength - 0.15)
+            self.ai_interval = min(self.MAX_INTERVAL, self.ai_interval * 1.15)
+
+    def make_guess(self, guess: Iterable[str], player: Optional[str] = None) -> None:
+        was_ongoing = self.status == "ongoing"
+        self.tick()
+        if was_ongoing and self.winner == AI_NAME:
+            # Yapay zekâ bu tahminden önce kazandı; tahmin sayılmaz, sonuç normal döner.
+            return
+        if self.status != "ongoing":
+            raise GameError("Oyun tamamlandı, yeni oyun başlatmalısın.")
+        if player and player != self.player_name:
+            raise GameError("Sıradaki oyuncu sen değilsin.")
+        guess_tuple = self._validate_guess(guess)
+        exact, color_only = feedback(self.secret, guess_tuple)
+        self.history.append(HistoryEntry(self.player_name, guess_tuple, exact, color_only))
+        self.remaining_attempts -= 1
+        if exact == self.length:
+            self.status = "won"
+            self.winner = self.player_name
+            self.message = (
+                f"Harika! {self.player_name} gizli kodu yapay zekâdan önce çözdü."
+            )
+            return
+        self.candidates.apply(guess_tuple, (exact, color_only))
+        if self.remaining_attempts <= 0:
+            self.status = "lost"
+            self.message = (
+                "Tahmin hakları bitti. Gizli kod: "
+                + pretty(self.secret)
+                + f" ({_colors_text(self.secret)})"
+            )
+            return
+        self._adapt()
+        self.message = (
+            f"Tam isabet: {exact}, doğru renk: {color_only}. "
+            f"Kalan olası kod: {len(self.candidates)}. "
+            f"{self.remaining_attempts} deneme kaldı."
+        )
+
+
 MODE_LABELS = {
     "player_vs_ai": PlayerVsAIGame.mode_label,
     "pvp_one_by_one": PvPOneByOneGame.mode_label,
+    "race_vs_ai": RaceVsAIGame.mode_label,
+    "player_vs_ai_offline": OfflinePlayerVsAIGame.mode_label,
 }
 
 
@@ -304,11 +625,19 @@ def create_game(
     symbols: Sequence[str],
     max_attempts: int,
     players: Optional[Sequence[str]] = None,
+    seed: Optional[int] = None,
+    offline: bool = False,
 ) -> BaseGame:
     players = list(players or [])
+    if offline and mode != "player_vs_ai":
+        raise GameError("Çevrimdışı oyun yalnızca Oyuncu vs Yapay Zekâ modunda oynanabilir.")
     if mode == "player_vs_ai":
         player_name = players[0] if players else None
-        return PlayerVsAIGame(length, symbols, max_attempts, player_name)
+        game_cls = OfflinePlayerVsAIGame if offline else PlayerVsAIGame
+        return game_cls(length, symbols, max_attempts, player_name, seed)
     if mode == "pvp_one_by_one":
-        return PvPOneByOneGame(length, symbols, max_attempts, players)
+        return PvPOneByOneGame(length, symbols, max_attempts, players, seed)
+    if mode == "race_vs_ai":
+        player_name = players[0] if players else None
+        return RaceVsAIGame(length, symbols, max_attempts, player_name, seed)
     raise GameError("Desteklenmeyen oyun modu seçildi.")